@@ -4,7 +4,421 @@ from PyQt6.QtGui import *
 import pandas as pd
 import polars as pl
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime
+from collections import OrderedDict
+from functools import reduce
+import operator
+
+
+def _format_value(value):
+    """Форматирует одиночное значение для отображения"""
+    # NaN - единственное значение, не равное самому себе
+    if value is None or value is pd.NA or value is pd.NaT or value != value:
+        return ""
+    elif isinstance(value, (np.integer, np.floating)):
+        # Для больших чисел добавляем разделители тысяч
+        if isinstance(value, np.integer):
+            return f"{value:,}"
+        else:
+            return f"{value:,.2f}"
+    elif isinstance(value, (datetime, pd.Timestamp)):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        return str(value)
+
+
+def _format_bool(series):
+    return series.map(str, na_action='ignore').fillna("").to_numpy(dtype=object)
+
+
+def _format_int(series):
+    # В NumPy int колонках пропусков не бывает
+    return series.map("{:,}".format).to_numpy(dtype=object)
+
+
+def _format_nullable_int(series):
+    return series.map("{:,}".format, na_action='ignore').fillna("").to_numpy(dtype=object)
+
+
+def _format_float(series):
+    values = series.to_numpy()
+    strings = series.map("{:,.2f}".format).to_numpy(dtype=object)
+    strings[values != values] = ""
+    return strings
+
+
+def _format_nullable_float(series):
+    return series.map("{:,.2f}".format, na_action='ignore').fillna("").to_numpy(dtype=object)
+
+
+def _format_datetime(series):
+    return series.dt.strftime("%Y-%m-%d %H:%M:%S").fillna("").to_numpy(dtype=object)
+
+
+def _format_object(series):
+    return series.map(_format_value).to_numpy(dtype=object)
+
+
+def _column_formatter(dtype):
+    """Выбирает векторный форматтер колонки pandas по ее типу"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return _format_bool
+    elif pd.api.types.is_integer_dtype(dtype):
+        # Nullable Int64 и Arrow типы могут содержать pd.NA
+        return _format_int if isinstance(dtype, np.dtype) else _format_nullable_int
+    elif pd.api.types.is_float_dtype(dtype):
+        return _format_float if isinstance(dtype, np.dtype) else _format_nullable_float
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        return _format_datetime
+    else:
+        return _format_object
+
+
+# Палитра градиента от синего к красному: возможны лишь 256 различных цветов
+_PALETTE = [QColor(red, 200, 255 - red) for red in range(256)]
+
+
+def _gradient_colors(normalized):
+    """Векторно переводит нормированные значения в индексы палитры градиента"""
+    with np.errstate(invalid='ignore'):
+        colors = np.minimum(255, (255 * np.nan_to_num(normalized)).astype(np.int16))
+    # -1 означает отсутствие цвета (пропущенное значение)
+    colors[np.isnan(normalized)] = -1
+    return colors
+
+
+# Размер блока при объединении масок: блок результата остается в кэше процессора
+_MASK_BLOCK = 1 << 16
+
+
+def _combine_masks(masks, n):
+    """Объединяет булевы маски по И за один проход по памяти"""
+    out = np.ones(n, dtype=bool)
+    if len(masks) < 3:
+        for mask in masks:
+            out &= mask
+        return out
+        
+    # Для многих масок каждый блок результата обрабатывается всеми масками
+    # сразу, вместо K полных проходов по массиву результата
+    for lo in range(0, n, _MASK_BLOCK):
+        block = out[lo:lo + _MASK_BLOCK]
+        for mask in masks:
+            np.logical_and(block, mask[lo:lo + _MASK_BLOCK], out=block)
+    return out
+
+
+class _FormatRingCache:
+    """Кэш отформатированных строк, заполняемый окнами по мере прокрутки"""
+    
+    def __init__(self, loader, window=512, max_windows=256):
+        # loader(col, lo, hi) -> массив строк для строк [lo, hi) колонки col
+        self._loader = loader
+        self._window = window
+        self._max_windows = max_windows
+        self._blocks = OrderedDict()
+        
+    def get(self, col, row):
+        """Возвращает строку ячейки, форматируя окно строк при промахе"""
+        block = row // self._window
+        key = (col, block)
+        strings = self._blocks.get(key)
+        if strings is None:
+            lo = block * self._window
+            strings = self._loader(col, lo, lo + self._window)
+            self._blocks[key] = strings
+            # Вытесняем самое старое окно
+            if len(self._blocks) > self._max_windows:
+                self._blocks.popitem(last=False)
+        return strings[row - block * self._window]
+        
+    def evict_outside(self, first_row, last_row, margin=1):
+        """Удаляет окна вне видимых строк [first_row, last_row] с запасом margin окон"""
+        lo = first_row // self._window - margin
+        hi = last_row // self._window + margin
+        for key in [key for key in self._blocks if not lo <= key[1] <= hi]:
+            del self._blocks[key]
+            
+    def clear(self):
+        """Очищает кэш"""
+        self._blocks.clear()
+
+
+class RowFilter:
+    """Векторная фильтрация строк: строит булеву маску по всему DataFrame"""
+    
+    def __init__(self):
+        # Поддерживаемые форматы дат для текстовых колонок
+        self._date_formats = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d.%m.%Y"]
+        # Найденный формат даты для каждой колонки: {col_name: fmt}
+        self._date_fmt_cache = {}
+        # Отсортированные числовые колонки: {col_name: (перестановка, значения)}.
+        # Фильтр принадлежит одной модели, а ее DataFrame не меняется
+        self._sorted_idx = {}
+        # Текстовые колонки в виде Arrow строк: {col_name: pa.Array}
+        self._text_arrays = {}
+        # Ошибки последнего применения фильтров для показа пользователю
+        self.errors = []
+        
+    def build_mask(self, df, filters):
+        """Возвращает маску видимых строк или None, если фильтров нет"""
+        self._date_fmt_cache = {}
+        self.errors = []
+        if not filters:
+            return None
+            
+        try:
+            if isinstance(df, pl.DataFrame):
+                return self.polars_mask(df, filters)
+            elif isinstance(df, pd.DataFrame):
+                return self.pandas_mask(df, filters)
+        except Exception as e:
+            self.errors.append(str(e))
+        return None
+        
+    def pandas_mask(self, df, filters):
+        """Строит маску для pandas, объединяя маски отдельных колонок"""
+        columns = {str(name): c for c, name in enumerate(df.columns)}
+        
+        # Только диапазоны по числовым колонкам: бинарный поиск вместо полного прохода
+        mask = self.pandas_range_mask(df, filters, columns)
+        if mask is not None:
+            return mask
+            
+        masks = []
+        for col_name, filter_data in filters.items():
+            col_index = columns.get(col_name, -1)
+            if col_index == -1:
+                continue
+            try:
+                column_mask = self.filter_mask_pandas(
+                    df.iloc[:, col_index], filter_data, col_name
+                )
+            except Exception as e:
+                # Ошибочный фильтр колонки пропускается, ошибка сообщается пользователю
+                self.errors.append(f"{col_name}: {e}")
+                continue
+            if column_mask is not None:
+                masks.append(column_mask)
+        return _combine_masks(masks, len(df))
+        
+    def pandas_range_mask(self, df, filters, columns):
+        """Возвращает маску для фильтров-диапазонов или None, если путь неприменим"""
+        ranges = []
+        for col_name, filter_data in filters.items():
+            col_index = columns.get(col_name, -1)
+            if col_index == -1:
+                continue
+            dtype = df.dtypes.iloc[col_index]
+            if (filter_data.get('type') != 'range' or not isinstance(dtype, np.dtype)
+                    or dtype.kind not in 'iuf'):
+                return None
+            ranges.append((col_name, col_index, filter_data))
+            
+        if not ranges:
+            return None
+            
+        mask = None
+        for col_name, col_index, filter_data in ranges:
+            cached = self._sorted_idx.get(col_name)
+            if cached is None:
+                values = df.iloc[:, col_index].to_numpy(dtype=np.float64)
+                order = np.argsort(values, kind='stable')
+                cached = (order, values[order])
+                self._sorted_idx[col_name] = cached
+                
+            order, sorted_vals = cached
+            # NaN сортируются в конец и не попадают ни в один диапазон
+            lo = np.searchsorted(sorted_vals, filter_data.get('min', -float('inf')), side='left')
+            hi = np.searchsorted(sorted_vals, filter_data.get('max', float('inf')), side='right')
+            # Маска строится по позициям без сортировки и пересечения множеств
+            column_mask = np.zeros(len(df), dtype=bool)
+            column_mask[order[lo:hi]] = True
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
+        
+    def polars_mask(self, df, filters):
+        """Строит маску для polars одним ленивым запросом"""
+        exprs = []
+        for col_name, filter_data in filters.items():
+            if col_name not in df.schema:
+                continue
+            try:
+                column_expr = self.filter_expr_polars(df, col_name, filter_data)
+            except Exception as e:
+                self.errors.append(f"{col_name}: {e}")
+                continue
+            if column_expr is not None:
+                exprs.append(column_expr)
+                
+        if not exprs:
+            return None
+            
+        # Все предикаты сливаются в одно выражение и отдаются оптимизатору
+        # polars; из запроса возвращаются только номера прошедших строк
+        rows = (
+            df.lazy()
+            .with_row_index("__row")
+            .filter(reduce(operator.and_, exprs))
+            .select("__row")
+            .collect()
+            .to_series()
+            .to_numpy()
+        )
+        mask = np.zeros(df.height, dtype=bool)
+        mask[rows] = True
+        return mask
+        
+    def filter_mask_pandas(self, series, filter_data, col_name=None):
+        """Возвращает булеву маску фильтра для колонки pandas"""
+        filter_type = filter_data.get('type')
+        dtype = series.dtype
+        
+        if filter_type == 'range':
+            min_val = filter_data.get('min', -float('inf'))
+            max_val = filter_data.get('max', float('inf'))
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                # Сравнение на сыром NumPy массиве, NaN не проходит ни одно условие
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = pd.to_numeric(series, errors='coerce').to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+            return (values >= min_val) & (values <= max_val)
+            
+        elif filter_type == 'text':
+            search_text = filter_data.get('value', '')
+            if not search_text:
+                return None
+            arr = self._text_arrays.get(col_name)
+            if arr is None:
+                # Значения приводятся к строкам один раз и хранятся в Arrow
+                values = series.astype("string").to_numpy(dtype=object, na_value=None)
+                arr = pa.array(values, type=pa.string())
+                self._text_arrays[col_name] = arr
+            # Поиск подстроки выполняется в C++ ядре Arrow
+            found = pc.match_substring(arr, search_text, ignore_case=True)
+            return pc.fill_null(found, False).to_numpy(zero_copy_only=False)
+            
+        elif filter_type == 'date':
+            date_from = pd.Timestamp(filter_data.get('from'))
+            # Конец диапазона включает весь день
+            date_to = pd.Timestamp(filter_data.get('to')) + pd.Timedelta(days=1)
+            if isinstance(dtype, np.dtype) and dtype.kind == 'M':
+                # Наивные datetime64 сравниваются в собственных единицах колонки
+                # (s/ms/us/ns) без приведения к наносекундам; NaT не проходит
+                values = series.to_numpy()
+                lo = date_from.to_datetime64().astype(dtype)
+                hi = date_to.to_datetime64().astype(dtype)
+                return (values >= lo) & (values < hi)
+                
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                dates = series
+            else:
+                # Формат определяется один раз по первому значению колонки
+                sample = series.dropna()
+                fmt = None
+                if len(sample):
+                    fmt = self.detect_date_format(str(sample.iloc[0]), col_name)
+                dates = pd.to_datetime(series.astype(str), format=fmt, errors='coerce')
+            tz = getattr(dates.dtype, 'tz', None)
+            if tz is not None:
+                # Границы диапазона задаются в часовом поясе колонки
+                date_from = date_from.tz_localize(tz)
+                date_to = date_to.tz_localize(tz)
+            dates = dates.dt.normalize()
+            return dates.between(date_from, date_to, inclusive='left').to_numpy(dtype=bool)
+            
+        elif filter_type == 'bool':
+            filter_value = filter_data.get('value')
+            if dtype == np.bool_:
+                # Булева колонка сама является маской
+                values = series.to_numpy()
+                if filter_value is True:
+                    return values.copy()
+                elif filter_value is False:
+                    return ~values
+                return None
+                
+            values = series.astype(str).str.lower()
+            if filter_value is True:
+                return values.isin(['true', '1', 'да', 'yes']).to_numpy()
+            elif filter_value is False:
+                return values.isin(['false', '0', 'нет', 'no']).to_numpy()
+                
+        return None
+        
+    def filter_expr_polars(self, df, col_name, filter_data):
+        """Возвращает выражение polars для фильтра колонки"""
+        filter_type = filter_data.get('type')
+        column = pl.col(col_name)
+        dtype = df.schema[col_name]
+        
+        if filter_type == 'range':
+            min_val = filter_data.get('min', -float('inf'))
+            max_val = filter_data.get('max', float('inf'))
+            return column.cast(pl.Float64, strict=False).is_between(min_val, max_val)
+            
+        elif filter_type == 'text':
+            search_text = filter_data.get('value', '').lower()
+            if not search_text:
+                return None
+            return (
+                column.cast(pl.Utf8).str.to_lowercase()
+                .str.contains(search_text, literal=True)
+            )
+            
+        elif filter_type == 'date':
+            if dtype == pl.Date:
+                dates = column
+            elif dtype == pl.Datetime:
+                dates = column.dt.date()
+            else:
+                # Формат определяется один раз по первому значению колонки
+                sample = df[col_name].drop_nulls()
+                fmt = None
+                if len(sample):
+                    fmt = self.detect_date_format(str(sample[0]), col_name)
+                if fmt is None:
+                    return pl.lit(False)
+                dates = column.cast(pl.Utf8).str.strptime(
+                    pl.Datetime, fmt, strict=False
+                ).dt.date()
+            return dates.is_between(filter_data.get('from'), filter_data.get('to'))
+            
+        elif filter_type == 'bool':
+            filter_value = filter_data.get('value')
+            if dtype == pl.Boolean:
+                if filter_value is True:
+                    return column
+                elif filter_value is False:
+                    return ~column
+                return None
+                
+            values = column.cast(pl.Utf8).str.to_lowercase()
+            if filter_value is True:
+                return values.is_in(['true', '1', 'да', 'yes'])
+            elif filter_value is False:
+                return values.is_in(['false', '0', 'нет', 'no'])
+                
+        return None
+        
+    def detect_date_format(self, value, col_name=None):
+        """Определяет формат даты значения и кэширует его для колонки"""
+        fmt = self._date_fmt_cache.get(col_name)
+        if fmt is not None:
+            return fmt
+            
+        for fmt in self._date_formats:
+            try:
+                datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            self._date_fmt_cache[col_name] = fmt
+            return fmt
+        return None
 
 
 class PandasTableModel(QAbstractTableModel):
@@ -12,58 +426,159 @@ class PandasTableModel(QAbstractTableModel):
     
     def __init__(self, data):
         super().__init__()
-        self._data = data.copy() if data is not None else pd.DataFrame()
-        self._original_data = data.copy() if data is not None else pd.DataFrame()
+        # Модель не изменяет исходный DataFrame (сортировка хранит перестановку
+        # строк), поэтому копии не нужны
+        self._data = data if data is not None else pd.DataFrame()
+        # Размеры DataFrame неизменны, поэтому вычисляются один раз
+        self._n_rows = len(self._data)
+        self._n_cols = len(self._data.columns)
+        # Порядок сортировки строк: позиция в порядке сортировки -> позиция в DataFrame
+        self._row_order = np.arange(self._n_rows)
+        self._is_sorted = False
+        # Перестановки строк для уже выполненных сортировок: {(колонка, порядок): ...}
+        self._sort_cache = {}
+        # Маска фильтра по позициям DataFrame (None - фильтров нет)
+        self._row_filter = RowFilter()
+        self._mask = None
+        self._update_visible()
+        self._enable_gradient = True
+        self._compute_stats()
+        self._build_column_cache()
+        
+    def _update_visible(self):
+        """Пересчитывает видимые строки: строка таблицы -> позиция в DataFrame"""
+        if self._mask is None:
+            self._visible = self._row_order
+        else:
+            self._visible = self._row_order[self._mask[self._row_order]]
+            
+    def set_filters(self, filters):
+        """Применяет фильтры одной векторной маской по всему DataFrame"""
+        self.beginResetModel()
+        self._mask = self._row_filter.build_mask(self._data, filters)
+        self._update_visible()
+        self._display_cache.clear()
+        self.endResetModel()
+        
+    def total_row_count(self):
+        """Возвращает число строк без учета фильтров"""
+        return self._n_rows
+        
+    def filter_errors(self):
+        """Возвращает ошибки, возникшие при последнем применении фильтров"""
+        return self._row_filter.errors
+        
+    def set_viewport(self, first_row, last_row):
+        """Освобождает отформатированные окна строк далеко от видимой области"""
+        self._display_cache.evict_outside(first_row, last_row)
+        
+    def set_gradient_enabled(self, enabled):
+        """Включает/выключает цветовой градиент фона ячеек"""
+        if self._enable_gradient == enabled:
+            return
+        self._enable_gradient = enabled
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.ItemDataRole.BackgroundRole]
+            )
+            
+    def _build_column_cache(self):
+        """Кэширует сведения о колонках: форматтеры, выравнивание, подсказки"""
+        self._columns = list(self._data.columns)
+        self._col_dtypes = list(self._data.dtypes)
+        # Форматтер и выравнивание выбираются один раз для каждой колонки
+        self._formatters = [_column_formatter(dtype) for dtype in self._col_dtypes]
+        self._alignments = [
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            else Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            for dtype in self._col_dtypes
+        ]
+        # Тип колонки для подсказок известен заранее
+        self._tooltip_prefix = [
+            f"Тип: {dtype}\nПропусков: {stats['nulls']}\nЗначение: "
+            for dtype, stats in zip(self._col_dtypes, self._stats)
+        ]
+        # Строки форматируются лениво, только для просматриваемых окон
+        self._display_cache = _FormatRingCache(self._format_rows)
+        self._color_cache = [None] * len(self._columns)
+        
+    def _get_color_column(self, col):
+        """Возвращает индексы палитры для колонки (None для нечисловых)"""
+        colors = self._color_cache[col]
+        if colors is None:
+            dtype = self._col_dtypes[col]
+            if (not pd.api.types.is_numeric_dtype(dtype)
+                    or pd.api.types.is_bool_dtype(dtype)):
+                colors = False
+            else:
+                values = self._data.iloc[:, col].to_numpy(dtype=np.float64, na_value=np.nan)
+                abs_max = self._stats[col]['abs_max']
+                colors = _gradient_colors(np.abs(values) / (abs_max + 1e-9))
+            self._color_cache[col] = colors
+        return colors if colors is not False else None
+        
+    def _format_rows(self, col, lo, hi):
+        """Векторно форматирует строки [lo, hi) колонки в порядке отображения"""
+        return self._formatters[col](self._data.iloc[self._visible[lo:hi], col])
+        
+    def _compute_stats(self):
+        """Вычисляет статистики всех колонок один раз при создании модели"""
+        nulls = self._data.isna().sum().to_numpy()
+        self._stats = [{'nulls': int(n)} for n in nulls]
+        
+        numeric_positions = [
+            c for c, dtype in enumerate(self._data.dtypes)
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        ]
+        if not numeric_positions:
+            return
+            
+        # Редукции по всем числовым колонкам сразу, без поячеечных сканов
+        numeric = self._data.iloc[:, numeric_positions]
+        mins = numeric.min().to_numpy(dtype=np.float64, na_value=np.nan)
+        maxs = numeric.max().to_numpy(dtype=np.float64, na_value=np.nan)
+        abs_maxs = numeric.abs().max().to_numpy(dtype=np.float64, na_value=np.nan)
+        for i, c in enumerate(numeric_positions):
+            self._stats[c].update(
+                min=float(mins[i]), max=float(maxs[i]), abs_max=float(abs_maxs[i])
+            )
         
     def rowCount(self, parent=None):
-        return len(self._data)
+        return len(self._visible)
     
     def columnCount(self, parent=None):
-        return len(self._data.columns)
+        return self._n_cols
     
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if not index.isValid():
             return None
             
         if role == Qt.ItemDataRole.DisplayRole:
-            value = self._data.iloc[index.row(), index.column()]
-            
-            # Форматирование различных типов данных
-            if pd.isna(value):
-                return ""
-            elif isinstance(value, (np.integer, np.floating)):
-                # Для больших чисел добавляем разделители тысяч
-                if isinstance(value, np.integer):
-                    return f"{value:,}"
-                else:
-                    return f"{value:,.2f}"
-            elif isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d %H:%M:%S")
-            elif isinstance(value, pd.Timestamp):
-                return value.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                return str(value)
-                
-        elif role == Qt.ItemDataRole.TextAlignmentRole:
-            value = self._data.iloc[index.row(), index.column()]
-            if isinstance(value, (int, float, np.integer, np.floating)):
-                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            else:
-                return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            return self._display_cache.get(index.column(), index.row()) or ""
+            
+        row = self._visible[index.row()]
+        
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self._alignments[index.column()]
                 
         elif role == Qt.ItemDataRole.BackgroundRole:
-            # Цветовая схема для числовых значений
-            value = self._data.iloc[index.row(), index.column()]
-            if isinstance(value, (int, float)) and not pd.isna(value):
-                # Градиент от синего к красному
-                normalized = abs(value) / (self._data.iloc[:, index.column()].abs().max() + 1e-9)
-                red = min(255, int(255 * normalized))
-                blue = 255 - red
-                return QColor(red, 200, blue)
+            if not self._enable_gradient:
+                return None
+                
+            # Цветовая схема для числовых значений: градиент от синего к красному
+            colors = self._get_color_column(index.column())
+            if colors is not None:
+                color = colors[row]
+                if color >= 0:
+                    return _PALETTE[color]
                 
         elif role == Qt.ItemDataRole.ToolTipRole:
-            value = self._data.iloc[index.row(), index.column()]
-            return f"Тип: {type(value).__name__}\nЗначение: {value}"
+            # Используем уже отформатированную строку из кэша отображения
+            col = index.column()
+            return self._tooltip_prefix[col] + self._display_cache.get(col, index.row())
             
         return None
         
@@ -72,33 +587,100 @@ class PandasTableModel(QAbstractTableModel):
             return None
             
         if orientation == Qt.Orientation.Horizontal:
-            return str(self._data.columns[section])
+            return str(self._columns[section])
         else:
             return str(section + 1)
             
     def get_column_dtype(self, column):
         """Возвращает тип данных колонки"""
         if column < self.columnCount():
-            dtype = str(self._data.dtypes[column])
-            return dtype
+            dtype = self._col_dtypes[column]
+            if isinstance(dtype, pd.ArrowDtype):
+                # Arrow типы приводим к общим именам NumPy
+                if pd.api.types.is_bool_dtype(dtype):
+                    return 'bool'
+                elif pd.api.types.is_integer_dtype(dtype):
+                    return 'int64'
+                elif pd.api.types.is_float_dtype(dtype):
+                    return 'float64'
+                elif pd.api.types.is_datetime64_any_dtype(dtype):
+                    return 'datetime64[ns]'
+                else:
+                    return 'object'
+            if pd.api.types.is_bool_dtype(dtype):
+                return 'bool'
+            if pd.api.types.is_integer_dtype(dtype):
+                # Любая разрядность (int8..uint64, после понижения типов) -
+                # числовой фильтр, как и в модели Polars
+                return 'int64'
+            if pd.api.types.is_float_dtype(dtype):
+                return 'float64'
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                # Единица времени (s/ms/us/ns) и часовой пояс для фильтров не важны
+                return 'datetime64[ns]'
+            if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+                # Категории и строки фильтруются как текст
+                return 'object'
+            return str(dtype)
         return 'object'
         
     def sort(self, column, order):
         """Сортировка данных"""
-        self.layoutAboutToBeChanged.emit()
-        
-        col_name = self._data.columns[column]
         ascending = (order == Qt.SortOrder.AscendingOrder)
+        old_visible = self._visible
         
         try:
-            self._data = self._data.sort_values(by=col_name, ascending=ascending)
+            # Сортируется только одна колонка; DataFrame и кэши колонок
+            # не перестраиваются, меняется лишь перестановка строк
+            key = (column, ascending)
+            row_order = self._sort_cache.get(key)
+            if row_order is None:
+                row_order = (
+                    self._data.iloc[:, column]
+                    .reset_index(drop=True)
+                    .sort_values(ascending=ascending, kind='stable')
+                    .index.to_numpy()
+                )
+                self._sort_cache[key] = row_order
+            self._row_order = row_order
+            self._is_sorted = True
+            # Фильтр не меняется - видимые строки лишь переупорядочиваются
+            self._update_visible()
+            # Окна строк привязаны к порядку отображения
+            self._display_cache.clear()
         except Exception as e:
             print(f"Ошибка сортировки: {e}")
+            return
+            
+        self._update_persistent_indexes(old_visible)
+        
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
+            )
+            
+    def _update_persistent_indexes(self, old_visible):
+        """Переносит постоянные индексы (выделение) согласно новой перестановке"""
+        old_indexes = self.persistentIndexList()
+        if not old_indexes:
+            return
             
-        self.layoutChanged.emit()
+        # Позиция в DataFrame -> новая строка таблицы
+        new_rows = np.empty(self._n_rows, dtype=np.intp)
+        new_rows[self._visible] = np.arange(len(self._visible))
+        
+        new_indexes = [
+            self.index(int(new_rows[old_visible[index.row()]]), index.column())
+            for index in old_indexes
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
         
     def get_dataframe(self):
-        """Возвращает DataFrame"""
+        """Возвращает видимые строки DataFrame в порядке отображения"""
+        if self._is_sorted or self._mask is not None:
+            return self._data.iloc[self._visible]
         return self._data.copy()
 
 
@@ -107,14 +689,163 @@ class PolarsTableModel(QAbstractTableModel):
     
     def __init__(self, data):
         super().__init__()
-        self._data = data.clone() if data is not None else pl.DataFrame()
-        self._original_data = data.clone() if data is not None else pl.DataFrame()
+        # Polars DataFrame неизменяем, поэтому клонирование не требуется
+        self._data = data if data is not None else pl.DataFrame()
+        # Размеры DataFrame неизменны, поэтому вычисляются один раз
+        self._n_rows = self._data.height
+        self._n_cols = self._data.width
+        # Сортировка и фильтрация не пересоздают DataFrame, а хранят
+        # перестановку строк и маску по позициям DataFrame
+        self._row_order = np.arange(self._n_rows)
+        self._is_sorted = False
+        # Перестановки строк для уже выполненных сортировок: {(колонка, порядок): ...}
+        self._sort_cache = {}
+        self._row_filter = RowFilter()
+        self._mask = None
+        self._update_visible()
+        self._enable_gradient = True
+        self._build_column_kinds()
+        self.refresh_stats()
+        self._build_column_cache()
+        
+    def _update_visible(self):
+        """Пересчитывает видимые строки: строка таблицы -> позиция в DataFrame"""
+        if self._mask is None:
+            self._visible = self._row_order
+        else:
+            self._visible = self._row_order[self._mask[self._row_order]]
+            
+    def set_filters(self, filters):
+        """Применяет фильтры одним выражением polars по всему DataFrame"""
+        self.beginResetModel()
+        self._mask = self._row_filter.build_mask(self._data, filters)
+        self._update_visible()
+        self._display_cache.clear()
+        self.endResetModel()
+        
+    def total_row_count(self):
+        """Возвращает число строк без учета фильтров"""
+        return self._n_rows
+        
+    def filter_errors(self):
+        """Возвращает ошибки, возникшие при последнем применении фильтров"""
+        return self._row_filter.errors
+        
+    def set_viewport(self, first_row, last_row):
+        """Освобождает отформатированные окна строк далеко от видимой области"""
+        self._display_cache.evict_outside(first_row, last_row)
+        
+    def set_gradient_enabled(self, enabled):
+        """Включает/выключает цветовой градиент фона ячеек"""
+        if self._enable_gradient == enabled:
+            return
+        self._enable_gradient = enabled
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.ItemDataRole.BackgroundRole]
+            )
+            
+    def _build_column_kinds(self):
+        """Определяет вид и выравнивание каждой колонки по ее типу"""
+        self._col_names = self._data.columns
+        self._col_dtypes = self._data.dtypes
+        self._col_kind = []
+        for dtype in self._col_dtypes:
+            if dtype.is_integer():
+                self._col_kind.append("int")
+            elif dtype.is_float():
+                self._col_kind.append("float")
+            elif dtype == pl.Date:
+                self._col_kind.append("date")
+            elif dtype == pl.Datetime:
+                self._col_kind.append("datetime")
+            else:
+                self._col_kind.append("other")
+                
+        self._col_is_numeric = [kind in ("int", "float") for kind in self._col_kind]
+        self._col_align = [
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            if is_numeric else
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            for is_numeric in self._col_is_numeric
+        ]
+        
+    def _build_column_cache(self):
+        """Конвертирует данные в Arrow один раз для быстрого доступа к ячейкам"""
+        # Таблица не сохраняется: после combine_chunks ее чанки больше не нужны
+        arrow = self._data.to_arrow()
+        # Каждая колонка - единый непрерывный Arrow массив
+        self._cols = [chunked.combine_chunks() for chunked in arrow.columns]
+        # Строки форматируются лениво, окнами по мере прокрутки
+        self._display_cache = _FormatRingCache(self._format_rows)
+        self._color_cache = [None] * len(self._cols)
+        
+    def _get_color_column(self, col):
+        """Возвращает индексы палитры для числовой колонки"""
+        colors = self._color_cache[col]
+        if colors is None:
+            min_val, max_val = self._col_minmax[self._col_names[col]]
+            if max_val is None or max_val == min_val:
+                colors = np.full(self._n_rows, -1, dtype=np.int16)
+            else:
+                values = self._data[self._col_names[col]].cast(pl.Float64).to_numpy()
+                colors = _gradient_colors((values - min_val) / (max_val - min_val))
+            self._color_cache[col] = colors
+        return colors
+                
+    def _format_rows(self, col, lo, hi):
+        """Форматирует строки [lo, hi) колонки в порядке отображения"""
+        values = self._cols[col].take(pa.array(self._visible[lo:hi])).to_pylist()
+        kind = self._col_kind[col]
+        
+        if kind == "int":
+            return ["" if v is None else f"{v:,}" for v in values]
+        elif kind == "float":
+            return ["" if v is None else f"{v:,.2f}" for v in values]
+        elif kind == "date":
+            return ["" if v is None else v.strftime("%Y-%m-%d") for v in values]
+        elif kind == "datetime":
+            return ["" if v is None else v.strftime("%Y-%m-%d %H:%M:%S") for v in values]
+        else:
+            return ["" if v is None else str(v) for v in values]
+            
+    def refresh_stats(self):
+        """Пересчитывает статистики колонок одним запросом"""
+        columns = self._data.columns
+        numeric_cols = [
+            name for name, dtype in self._data.schema.items() if dtype.is_numeric()
+        ]
+        n_numeric = len(numeric_cols)
+        
+        self._stats = {}
+        self._col_minmax = {}
+        if columns:
+            # Псевдонимы по номеру, чтобы не конфликтовать с именами колонок
+            row = self._data.select(
+                [pl.col(c).min().alias(f"min_{i}") for i, c in enumerate(numeric_cols)] +
+                [pl.col(c).max().alias(f"max_{i}") for i, c in enumerate(numeric_cols)] +
+                [pl.col(c).null_count().alias(f"nulls_{i}") for i, c in enumerate(columns)]
+            ).row(0)
+            
+            for i, name in enumerate(columns):
+                self._stats[name] = {'nulls': row[2 * n_numeric + i]}
+            for i, name in enumerate(numeric_cols):
+                min_val, max_val = row[i], row[n_numeric + i]
+                self._stats[name].update(min=min_val, max=max_val)
+                self._col_minmax[name] = (min_val, max_val)
+                
+        self._tooltip_prefix = [
+            f"Колонка: {name}\nТип: {dtype}\nПропусков: {self._stats[name]['nulls']}\nЗначение: "
+            for name, dtype in zip(self._col_names, self._col_dtypes)
+        ]
         
     def rowCount(self, parent=None):
-        return self._data.height
+        return len(self._visible)
     
     def columnCount(self, parent=None):
-        return self._data.width
+        return self._n_cols
     
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if not index.isValid():
@@ -125,72 +856,36 @@ class PolarsTableModel(QAbstractTableModel):
             col = index.column()
             
             if row < self.rowCount() and col < self.columnCount():
-                value = self._data[row, col]
-                
-                # Обработка null значений
-                if value is None:
-                    return ""
-                    
-                # Форматирование
-                col_name = self._data.columns[col]
-                dtype = self._data[col_name].dtype
-                
-                if dtype in [pl.Int8, pl.Int16, pl.Int32, pl.Int64, pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64]:
-                    return f"{value:,}"
-                elif dtype in [pl.Float32, pl.Float64]:
-                    return f"{value:,.2f}"
-                elif dtype == pl.Date:
-                    return value.strftime("%Y-%m-%d")
-                elif dtype == pl.Datetime:
-                    return value.strftime("%Y-%m-%d %H:%M:%S")
-                else:
-                    return str(value)
+                # Окно строк форматируется целиком при первом обращении
+                return self._display_cache.get(col, row)
                     
         elif role == Qt.ItemDataRole.TextAlignmentRole:
-            col_name = self._data.columns[index.column()]
-            dtype = self._data[col_name].dtype
-            
-            if dtype in [pl.Int8, pl.Int16, pl.Int32, pl.Int64, 
-                        pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
-                        pl.Float32, pl.Float64]:
-                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
-            else:
-                return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            return self._col_align[index.column()]
                 
         elif role == Qt.ItemDataRole.BackgroundRole:
+            if not self._enable_gradient:
+                return None
+                
             # Цветовая схема
             row = index.row()
             col = index.column()
             
             if row < self.rowCount() and col < self.columnCount():
-                value = self._data[row, col]
-                col_name = self._data.columns[col]
-                dtype = self._data[col_name].dtype
-                
-                if dtype in [pl.Int8, pl.Int16, pl.Int32, pl.Int64, 
-                           pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
-                           pl.Float32, pl.Float64] and value is not None:
-                    
-                    # Получаем максимальное значение в колонке
-                    max_val = self._data[col_name].max()
-                    min_val = self._data[col_name].min()
+                if not self._col_is_numeric[col]:
+                    return None
                     
-                    if max_val != min_val:
-                        normalized = (value - min_val) / (max_val - min_val)
-                        red = min(255, int(255 * normalized))
-                        blue = 255 - red
-                        return QColor(red, 200, blue)
+                # Цвета колонки предвычислены по кэшированным min/max
+                color = self._get_color_column(col)[self._visible[row]]
+                if color >= 0:
+                    return _PALETTE[color]
                         
         elif role == Qt.ItemDataRole.ToolTipRole:
             row = index.row()
             col = index.column()
             
             if row < self.rowCount() and col < self.columnCount():
-                value = self._data[row, col]
-                col_name = self._data.columns[col]
-                dtype = self._data[col_name].dtype
-                
-                return f"Колонка: {col_name}\nТип: {dtype}\nЗначение: {value}"
+                # Используем уже отформатированную строку из кэша отображения
+                return self._tooltip_prefix[col] + (self._display_cache.get(col, row) or "")
                 
         return None
         
@@ -199,21 +894,21 @@ class PolarsTableModel(QAbstractTableModel):
             return None
             
         if orientation == Qt.Orientation.Horizontal:
-            return str(self._data.columns[section])
+            return str(self._col_names[section])
         else:
             return str(section + 1)
             
     def get_column_dtype(self, column):
         """Возвращает тип данных колонки"""
         if column < self.columnCount():
-            col_name = self._data.columns[column]
-            dtype = str(self._data[col_name].dtype)
-            # Приводим к общим типам для совместимости
-            if 'Int' in dtype or 'UInt' in dtype:
+            # Приводим к общим типам для совместимости; вид колонки
+            # уже определен по нативным предикатам типа polars
+            kind = self._col_kind[column]
+            if kind == "int":
                 return 'int64'
-            elif 'Float' in dtype:
+            elif kind == "float":
                 return 'float64'
-            elif 'Date' in dtype:
+            elif kind in ("date", "datetime"):
                 return 'datetime64[ns]'
             else:
                 return 'object'
@@ -221,118 +916,53 @@ class PolarsTableModel(QAbstractTableModel):
         
     def sort(self, column, order):
         """Сортировка данных"""
-        self.layoutAboutToBeChanged.emit()
-        
         col_name = self._data.columns[column]
         descending = (order == Qt.SortOrder.DescendingOrder)
+        old_visible = self._visible
         
         try:
-            self._data = self._data.sort(col_name, descending=descending)
+            # DataFrame, Arrow кэш и статистики не перестраиваются,
+            # меняется лишь перестановка строк
+            key = (column, descending)
+            row_order = self._sort_cache.get(key)
+            if row_order is None:
+                row_order = self._data[col_name].arg_sort(descending=descending).to_numpy()
+                self._sort_cache[key] = row_order
+            self._row_order = row_order
+            self._is_sorted = True
+            self._update_visible()
+            self._display_cache.clear()
         except Exception as e:
             print(f"Ошибка сортировки: {e}")
+            return
             
-        self.layoutChanged.emit()
+        self._update_persistent_indexes(old_visible)
         
-    def get_dataframe(self):
-        """Возвращает DataFrame"""
-        return self._data.clone()
-
-
-class SortFilterProxyModel(QSortFilterProxyModel):
-    """Прокси-модель для фильтрации данных"""
-    
-    def __init__(self):
-        super().__init__()
-        self._filters = {}
-        
-    def set_filters(self, filters):
-        """Устанавливает фильтры"""
-        self._filters = filters
-        self.invalidateFilter()
-        
-    def filterAcceptsRow(self, source_row, source_parent):
-        """Проверяет, проходит ли строка фильтрацию"""
-        source_model = self.sourceModel()
-        if not source_model:
-            return True
-            
-        # Применяем все фильтры
-        for col_name, filter_data in self._filters.items():
-            # Находим индекс колонки
-            col_index = -1
-            for i in range(source_model.columnCount()):
-                if source_model.headerData(i, Qt.Orientation.Horizontal) == col_name:
-                    col_index = i
-                    break
-                    
-            if col_index == -1:
-                continue
-                
-            # Получаем значение ячейки
-            index = source_model.index(source_row, col_index, source_parent)
-            value = source_model.data(index, Qt.ItemDataRole.DisplayRole)
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
+            )
             
-            # Применяем фильтр в зависимости от типа
-            if not self.apply_filter(value, filter_data):
-                return False
-                
-        return True
+    def _update_persistent_indexes(self, old_visible):
+        """Переносит постоянные индексы (выделение) согласно новой перестановке"""
+        old_indexes = self.persistentIndexList()
+        if not old_indexes:
+            return
+            
+        # Позиция в DataFrame -> новая строка таблицы
+        new_rows = np.empty(self._n_rows, dtype=np.intp)
+        new_rows[self._visible] = np.arange(len(self._visible))
         
-    def apply_filter(self, value, filter_data):
-        """Применяет конкретный фильтр к значению"""
-        filter_type = filter_data.get('type')
+        new_indexes = [
+            self.index(int(new_rows[old_visible[index.row()]]), index.column())
+            for index in old_indexes
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
         
-        try:
-            if filter_type == 'range':
-                min_val = filter_data.get('min', -float('inf'))
-                max_val = filter_data.get('max', float('inf'))
-                
-                # Пытаемся преобразовать значение в число
-                try:
-                    num_val = float(str(value).replace(',', ''))
-                    return min_val <= num_val <= max_val
-                except (ValueError, TypeError):
-                    return False
-                    
-            elif filter_type == 'text':
-                search_text = filter_data.get('value', '').lower()
-                if not search_text:
-                    return True
-                return search_text in str(value).lower()
-                
-            elif filter_type == 'date':
-                date_from = filter_data.get('from')
-                date_to = filter_data.get('to')
-                
-                try:
-                    # Пытаемся разобрать дату
-                    if isinstance(value, str):
-                        # Пробуем разные форматы дат
-                        for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%d.%m.%Y"]:
-                            try:
-                                date_val = datetime.strptime(value, fmt)
-                                break
-                            except ValueError:
-                                continue
-                        else:
-                            return False
-                    else:
-                        date_val = value
-                        
-                    return date_from <= date_val.date() <= date_to
-                except (ValueError, TypeError, AttributeError):
-                    return False
-                    
-            elif filter_type == 'bool':
-                filter_value = filter_data.get('value')
-                value_str = str(value).lower()
-                
-                if filter_value is True:
-                    return value_str in ['true', '1', 'да', 'yes']
-                elif filter_value is False:
-                    return value_str in ['false', '0', 'нет', 'no']
-                    
-        except Exception:
-            return True  # В случае ошибки пропускаем строку
-            
-        return True
\ No newline at end of file
+    def get_dataframe(self):
+        """Возвращает видимые строки DataFrame в порядке отображения"""
+        if self._is_sorted or self._mask is not None:
+            return self._data[self._visible]
+        return self._data.clone()
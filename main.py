@@ -15,8 +15,8 @@ from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEngineSettings
 
 # Импортируем кастомные модули
-from data_models import PandasTableModel, PolarsTableModel, SortFilterProxyModel
-from workers import DataLoaderThread, ExportWorker
+from data_models import PandasTableModel, PolarsTableModel
+from workers import DataLoaderWorker, ExportWorker, ConversionWorker, AnalysisWorker
 from visualization import (
     MatplotlibWidget, 
     PlotlyWidget, 
@@ -26,6 +26,19 @@ from visualization import (
 from utils import DataProcessor, DataConverter, StyleManager
 
 
+# Границы полей диапазона в фильтре: значение на границе означает "без ограничения"
+_SPIN_MIN = -1e18
+_SPIN_MAX = 1e18
+
+# Параметры диалога сохранения для форматов экспорта: (заголовок, фильтр, расширение)
+_EXPORT_DIALOGS = {
+    'csv': ("Экспорт в CSV", "CSV файлы (*.csv)", '.csv'),
+    'excel': ("Экспорт в Excel", "Excel файлы (*.xlsx)", '.xlsx'),
+    'json': ("Экспорт в JSON", "JSON файлы (*.json)", '.json'),
+    'parquet': ("Экспорт в Parquet", "Parquet файлы (*.parquet)", '.parquet'),
+}
+
+
 class DataViewWidget(QWidget):
     """Виджет для отображения табличных данных"""
     def __init__(self, parent=None):
@@ -41,12 +54,17 @@ class DataViewWidget(QWidget):
         self.sort_desc_btn = QAction("Сортировка ↓", self)
         self.filter_btn = QAction("Фильтр", self)
         self.clear_filter_btn = QAction("Очистить", self)
+        self.gradient_btn = QAction("Градиент", self)
+        self.gradient_btn.setCheckable(True)
+        self.gradient_btn.setChecked(True)
         
         toolbar.addAction(self.sort_asc_btn)
         toolbar.addAction(self.sort_desc_btn)
         toolbar.addSeparator()
         toolbar.addAction(self.filter_btn)
         toolbar.addAction(self.clear_filter_btn)
+        toolbar.addSeparator()
+        toolbar.addAction(self.gradient_btn)
         
         # Таблица
         self.table_view = QTableView()
@@ -54,9 +72,8 @@ class DataViewWidget(QWidget):
         self.table_view.setSortingEnabled(True)
         self.table_view.horizontalHeader().setStretchLastSection(True)
         
-        # Прокси модель для фильтрации
-        self.proxy_model = SortFilterProxyModel()
-        self.table_view.setModel(self.proxy_model)
+        # Модель сама сортирует и фильтрует строки, без прокси-слоя
+        self.model = None
         
         # Статус бар
         self.status_label = QLabel("Готово")
@@ -69,6 +86,8 @@ class DataViewWidget(QWidget):
         # Подключаем сигналы
         self.filter_btn.triggered.connect(self.open_filter_dialog)
         self.clear_filter_btn.triggered.connect(self.clear_filter)
+        self.gradient_btn.toggled.connect(self.set_gradient_enabled)
+        self.table_view.verticalScrollBar().valueChanged.connect(self.on_scroll)
         
     def set_data(self, df, data_lib='pandas'):
         """Устанавливает данные в модель"""
@@ -79,40 +98,71 @@ class DataViewWidget(QWidget):
         else:
             raise ValueError(f"Неподдерживаемая библиотека: {data_lib}")
             
-        self.proxy_model.setSourceModel(model)
+        model.set_gradient_enabled(self.gradient_btn.isChecked())
+        self.model = model
+        self.table_view.setModel(model)
         self.status_label.setText(f"Загружено {len(df)} строк, {len(df.columns)} колонок")
         
+    def on_scroll(self, value):
+        """Сообщает модели видимые строки, чтобы она освободила дальние окна"""
+        if not self.model:
+            return
+            
+        first_row = max(self.table_view.rowAt(0), 0)
+        last_row = self.table_view.rowAt(self.table_view.viewport().height() - 1)
+        if last_row < 0:
+            last_row = self.model.rowCount() - 1
+        self.model.set_viewport(first_row, max(last_row, first_row))
+        
+    def set_gradient_enabled(self, enabled):
+        """Включает/выключает цветовой градиент в таблице"""
+        if self.model:
+            self.model.set_gradient_enabled(enabled)
+            
     def open_filter_dialog(self):
         """Открывает диалог фильтрации"""
-        if not self.proxy_model.sourceModel():
+        if not self.model:
             return
             
-        dialog = FilterDialog(self.proxy_model, self)
+        dialog = FilterDialog(self.model, self)
         if dialog.exec():
             filters = dialog.get_filters()
             self.apply_filters(filters)
             
     def apply_filters(self, filters):
         """Применяет фильтры к данным"""
-        self.proxy_model.set_filters(filters)
-        visible_rows = self.proxy_model.rowCount()
-        total_rows = self.proxy_model.sourceModel().rowCount()
+        self.model.set_filters(filters)
+        visible_rows = self.model.rowCount()
+        total_rows = self.model.total_row_count()
         self.status_label.setText(
             f"Показано {visible_rows} из {total_rows} строк"
         )
         
+        errors = self.model.filter_errors()
+        if errors:
+            QMessageBox.warning(
+                self, "Ошибка фильтрации",
+                "Не удалось применить фильтры:\n" + "\n".join(errors)
+            )
+        
     def clear_filter(self):
         """Очищает фильтры"""
-        self.proxy_model.set_filters({})
-        total_rows = self.proxy_model.sourceModel().rowCount()
+        if not self.model:
+            return
+            
+        self.model.set_filters({})
+        total_rows = self.model.total_row_count()
         self.status_label.setText(f"Показано {total_rows} строк")
 
 
 class FilterDialog(QDialog):
     """Диалог настройки фильтров"""
-    def __init__(self, proxy_model, parent=None):
+    # Сколько групп колонок создается за один раз
+    VISIBLE_WINDOW = 20
+    
+    def __init__(self, model, parent=None):
         super().__init__(parent)
-        self.proxy_model = proxy_model
+        self.model = model
         self.filters = {}
         self.init_ui()
         
@@ -121,85 +171,33 @@ class FilterDialog(QDialog):
         self.setModal(True)
         layout = QVBoxLayout()
         
-        source_model = self.proxy_model.sourceModel()
+        # Получаем информацию о колонках
+        self.column_widgets = {}
+        self.columns = []
+        self.built_count = 0
+        
+        source_model = self.model
         if not source_model:
             layout.addWidget(QLabel("Нет данных для фильтрации"))
             self.setLayout(layout)
             return
             
-        # Получаем информацию о колонках
-        self.column_widgets = {}
-        
+        # Имена и типы колонок дешевы, а виджеты создаются по мере прокрутки
         for col in range(source_model.columnCount()):
             column_name = source_model.headerData(col, Qt.Orientation.Horizontal)
             dtype = source_model.get_column_dtype(col)
+            self.columns.append((column_name, dtype))
             
-            group = QGroupBox(column_name)
-            group_layout = QVBoxLayout()
-            
-            # В зависимости от типа данных создаем разные виджеты
-            if dtype in ['int64', 'float64', 'int32', 'float32']:
-                min_spin = QDoubleSpinBox()
-                min_spin.setRange(-1e9, 1e9)
-                min_spin.setValue(-1e9)
-                max_spin = QDoubleSpinBox()
-                max_spin.setRange(-1e9, 1e9)
-                max_spin.setValue(1e9)
-                
-                group_layout.addWidget(QLabel("Мин:"))
-                group_layout.addWidget(min_spin)
-                group_layout.addWidget(QLabel("Макс:"))
-                group_layout.addWidget(max_spin)
-                
-                self.column_widgets[column_name] = {
-                    'type': 'range',
-                    'min': min_spin,
-                    'max': max_spin,
-                    'dtype': dtype
-                }
-                
-            elif dtype == 'object':
-                line_edit = QLineEdit()
-                line_edit.setPlaceholderText("Текст для поиска...")
-                group_layout.addWidget(line_edit)
-                self.column_widgets[column_name] = {
-                    'type': 'text',
-                    'widget': line_edit
-                }
-                
-            elif dtype == 'datetime64[ns]':
-                date_from = QDateEdit()
-                date_from.setCalendarPopup(True)
-                date_from.setDate(QDate.currentDate().addYears(-1))
-                date_to = QDateEdit()
-                date_to.setCalendarPopup(True)
-                date_to.setDate(QDate.currentDate())
-                
-                group_layout.addWidget(QLabel("С:"))
-                group_layout.addWidget(date_from)
-                group_layout.addWidget(QLabel("По:"))
-                group_layout.addWidget(date_to)
-                
-                self.column_widgets[column_name] = {
-                    'type': 'date',
-                    'from': date_from,
-                    'to': date_to
-                }
-                
-            elif dtype == 'bool':
-                combo = QComboBox()
-                combo.addItem("Любое", None)
-                combo.addItem("True", True)
-                combo.addItem("False", False)
-                group_layout.addWidget(combo)
-                self.column_widgets[column_name] = {
-                    'type': 'bool',
-                    'widget': combo
-                }
-                
-            group.setLayout(group_layout)
-            layout.addWidget(group)
-            
+        container = QWidget()
+        self.groups_layout = QVBoxLayout(container)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(container)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_scroll)
+        
+        self.build_groups(self.VISIBLE_WINDOW)
+        layout.addWidget(self.scroll_area)
+        
         # Кнопки
         button_box = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | 
@@ -212,6 +210,108 @@ class FilterDialog(QDialog):
         self.setLayout(layout)
         self.resize(400, 600)
         
+    def on_scroll(self, value):
+        """Создает следующие группы колонок при прокрутке к концу списка"""
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.build_groups(self.VISIBLE_WINDOW)
+            
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.fill_viewport()
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.fill_viewport()
+        
+    def fill_viewport(self):
+        """Достраивает группы, пока они не заполнят область прокрутки"""
+        # Без полосы прокрутки valueChanged не приходит, и остальные колонки
+        # были бы недоступны, поэтому группы создаются до появления прокрутки
+        if getattr(self, 'scroll_area', None) is None:
+            return
+        container = self.scroll_area.widget()
+        viewport = self.scroll_area.viewport()
+        while (self.built_count < len(self.columns)
+               and container.sizeHint().height() <= viewport.height()):
+            self.build_groups(self.VISIBLE_WINDOW)
+            
+    def build_groups(self, count):
+        """Создает группы виджетов для следующих count колонок"""
+        end = min(self.built_count + count, len(self.columns))
+        for column_name, dtype in self.columns[self.built_count:end]:
+            self.groups_layout.addWidget(self.create_column_group(column_name, dtype))
+        self.built_count = end
+        
+    def create_column_group(self, column_name, dtype):
+        """Создает группу виджетов фильтра для одной колонки"""
+        group = QGroupBox(column_name)
+        group_layout = QVBoxLayout()
+        
+        # В зависимости от типа данных создаем разные виджеты
+        if dtype in ['int64', 'float64', 'int32', 'float32']:
+            min_spin = QDoubleSpinBox()
+            min_spin.setRange(_SPIN_MIN, _SPIN_MAX)
+            min_spin.setValue(_SPIN_MIN)
+            min_spin.setSpecialValueText("—")
+            max_spin = QDoubleSpinBox()
+            max_spin.setRange(_SPIN_MIN, _SPIN_MAX)
+            max_spin.setValue(_SPIN_MAX)
+            
+            group_layout.addWidget(QLabel("Мин:"))
+            group_layout.addWidget(min_spin)
+            group_layout.addWidget(QLabel("Макс:"))
+            group_layout.addWidget(max_spin)
+            
+            self.column_widgets[column_name] = {
+                'type': 'range',
+                'min': min_spin,
+                'max': max_spin,
+                'dtype': dtype
+            }
+            
+        elif dtype == 'object':
+            line_edit = QLineEdit()
+            line_edit.setPlaceholderText("Текст для поиска...")
+            group_layout.addWidget(line_edit)
+            self.column_widgets[column_name] = {
+                'type': 'text',
+                'widget': line_edit
+            }
+            
+        elif dtype == 'datetime64[ns]':
+            date_from = QDateEdit()
+            date_from.setCalendarPopup(True)
+            date_from.setDate(QDate.currentDate().addYears(-1))
+            date_to = QDateEdit()
+            date_to.setCalendarPopup(True)
+            date_to.setDate(QDate.currentDate())
+            
+            group_layout.addWidget(QLabel("С:"))
+            group_layout.addWidget(date_from)
+            group_layout.addWidget(QLabel("По:"))
+            group_layout.addWidget(date_to)
+            
+            self.column_widgets[column_name] = {
+                'type': 'date',
+                'from': date_from,
+                'to': date_to
+            }
+            
+        elif dtype == 'bool':
+            combo = QComboBox()
+            combo.addItem("Любое", None)
+            combo.addItem("True", True)
+            combo.addItem("False", False)
+            group_layout.addWidget(combo)
+            self.column_widgets[column_name] = {
+                'type': 'bool',
+                'widget': combo
+            }
+            
+        group.setLayout(group_layout)
+        return group
+        
     def get_filters(self):
         """Возвращает словарь фильтров"""
         filters = {}
@@ -221,7 +321,7 @@ class FilterDialog(QDialog):
             if widgets['type'] == 'range':
                 min_val = widgets['min'].value()
                 max_val = widgets['max'].value()
-                if min_val > -1e9 or max_val < 1e9:
+                if min_val != _SPIN_MIN or max_val != _SPIN_MAX:
                     filter_data = {
                         'type': 'range',
                         'min': float(min_val),
@@ -256,6 +356,15 @@ class FilterDialog(QDialog):
             if filter_data:
                 filters[col_name] = filter_data
                 
+        # Для еще не созданных групп дат действует диапазон по умолчанию
+        for column_name, dtype in self.columns[self.built_count:]:
+            if dtype == 'datetime64[ns]':
+                filters[column_name] = {
+                    'type': 'date',
+                    'from': QDate.currentDate().addYears(-1).toPyDate(),
+                    'to': QDate.currentDate().toPyDate()
+                }
+                
         return filters
 
 
@@ -264,6 +373,10 @@ class DashboardTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.data = None
+        self._numeric_cols = set()
+        # Параметры последнего графика и вкладки, где он уже построен
+        self._last_params = None
+        self._rendered = set()
         self.init_ui()
         
     def init_ui(self):
@@ -282,8 +395,13 @@ class DashboardTab(QWidget):
             "Гистограмма"
         ])
         
+        # Списки колонок заменяются целиком через модели комбобоксов
+        self.x_axis_model = QStringListModel(self)
+        self.y_axis_model = QStringListModel(self)
         self.x_axis_combo = QComboBox()
+        self.x_axis_combo.setModel(self.x_axis_model)
         self.y_axis_combo = QComboBox()
+        self.y_axis_combo.setModel(self.y_axis_model)
         
         self.refresh_btn = QPushButton("Обновить график")
         self.refresh_btn.clicked.connect(self.update_chart)
@@ -300,45 +418,61 @@ class DashboardTab(QWidget):
         control_panel.setLayout(control_layout)
         
         # Виджеты визуализации
-        tab_widget = QTabWidget()
+        self.chart_tabs = QTabWidget()
         
         # Matplotlib
         self.matplotlib_widget = MatplotlibWidget()
-        tab_widget.addTab(self.matplotlib_widget, "Matplotlib")
+        self.chart_tabs.addTab(self.matplotlib_widget, "Matplotlib")
         
         # Plotly
         self.plotly_widget = PlotlyWidget()
-        tab_widget.addTab(self.plotly_widget, "Plotly")
+        self.chart_tabs.addTab(self.plotly_widget, "Plotly")
         
         # PyQtGraph
         self.pyqtgraph_widget = PyQtGraphWidget()
-        tab_widget.addTab(self.pyqtgraph_widget, "PyQtGraph (Real-time)")
+        self.chart_tabs.addTab(self.pyqtgraph_widget, "PyQtGraph (Real-time)")
+        
+        # Невидимые вкладки перерисовываются только при переключении на них
+        self.chart_tabs.currentChanged.connect(self.on_chart_tab_changed)
         
         layout.addWidget(control_panel)
-        layout.addWidget(tab_widget)
+        layout.addWidget(self.chart_tabs)
         self.setLayout(layout)
         
-    def set_data(self, df):
+    def set_data(self, df, columns=None):
         """Устанавливает данные и обновляет комбобоксы"""
         self.data = df
-        columns = list(df.columns)
-        
-        self.x_axis_combo.clear()
-        self.y_axis_combo.clear()
-        
-        self.x_axis_combo.addItems(columns)
-        self.y_axis_combo.addItems(columns)
-        
+        # Построенные графики относятся к прежним данным
+        self._last_params = None
+        self._rendered.clear()
+        # Кортеж колонок может быть уже вычислен вызывающим кодом
+        if columns is None:
+            columns = tuple(df.columns)
+        
+        # Один сброс модели вместо сигналов на каждый элемент
+        with QSignalBlocker(self.x_axis_combo), QSignalBlocker(self.y_axis_combo):
+            self.x_axis_model.setStringList(list(columns))
+            self.y_axis_model.setStringList(list(columns))
+            self.x_axis_combo.setCurrentIndex(0 if columns else -1)
+            self.y_axis_combo.setCurrentIndex(0 if columns else -1)
+        
+        # Числовые колонки определяются по схеме, без обращения к данным колонок
+        if isinstance(df, pl.DataFrame):
+            self._numeric_cols = {
+                col for col, dtype in df.schema.items() if dtype.is_numeric()
+            }
+        else:
+            # Учитываются и Arrow типы после конвертации из polars
+            self._numeric_cols = {
+                col for col, dtype in df.dtypes.items()
+                if pd.api.types.is_numeric_dtype(dtype)
+                and not pd.api.types.is_bool_dtype(dtype)
+            }
+            
         # Выбираем подходящие колонки по умолчанию
-        numeric_cols = [col for col in columns if self.is_numeric(df[col])]
+        numeric_cols = [col for col in columns if col in self._numeric_cols]
         if numeric_cols:
             self.y_axis_combo.setCurrentText(numeric_cols[0])
-            
-    def is_numeric(self, series):
-        """Проверяет, является ли серия числовой"""
-        if hasattr(series, 'dtype'):
-            return pd.api.types.is_numeric_dtype(series.dtype)
-        return False
         
     def update_chart(self):
         """Обновляет все графики"""
@@ -349,19 +483,35 @@ class DashboardTab(QWidget):
         x_col = self.x_axis_combo.currentText()
         y_col = self.y_axis_combo.currentText()
         
-        # Matplotlib
-        self.matplotlib_widget.update_chart(
-            self.data, chart_type, x_col, y_col
-        )
-        
-        # Plotly
-        fig = create_plotly_figure(self.data, chart_type, x_col, y_col)
-        self.plotly_widget.set_figure(fig)
+        self._last_params = (chart_type, x_col, y_col)
+        self._rendered.clear()
+        self.render_tab(self.chart_tabs.currentIndex())
         
-        # PyQtGraph
-        self.pyqtgraph_widget.update_chart(
-            self.data, chart_type, x_col, y_col
-        )
+    def on_chart_tab_changed(self, index):
+        """Строит график на открытой вкладке, если он еще не построен"""
+        if self._last_params is not None and index not in self._rendered:
+            self.render_tab(index)
+            
+    def render_tab(self, index):
+        """Строит последний график средствами библиотеки вкладки index"""
+        chart_type, x_col, y_col = self._last_params
+        widget = self.chart_tabs.widget(index)
+        
+        if widget is self.matplotlib_widget:
+            self.matplotlib_widget.update_chart(
+                self.data, chart_type, x_col, y_col
+            )
+            
+        elif widget is self.plotly_widget:
+            fig = create_plotly_figure(self.data, chart_type, x_col, y_col)
+            self.plotly_widget.set_figure(fig)
+            
+        elif widget is self.pyqtgraph_widget:
+            self.pyqtgraph_widget.update_chart(
+                self.data, chart_type, x_col, y_col
+            )
+            
+        self._rendered.add(index)
 
 
 class MainWindow(QMainWindow):
@@ -369,8 +519,15 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.current_data = None
+        # Колонки текущих данных, вычисляются один раз при загрузке
+        self._columns = ()
         self.current_data_lib = 'pandas'
         self.data_processor = DataProcessor()
+        # Результаты анализа текущих данных: {(поколение данных, вид анализа): результат}
+        self._analysis_cache = {}
+        # Номер поколения данных растет при каждой смене current_data; в отличие
+        # от id(), он не повторяется для новых данных после освобождения старых
+        self._data_generation = 0
         self.init_ui()
         self.apply_styles()
         
@@ -438,10 +595,43 @@ class MainWindow(QMainWindow):
         self.results_text.setReadOnly(True)
         self.results_text.setFont(QFont("Courier", 10))
         
+        # Табличные результаты (корреляция, статистика, группировка)
+        # отображаются моделью без форматирования всей таблицы в текст
+        self.stats_view = QTableView()
+        self.stats_view.setAlternatingRowColors(True)
+        self.stats_view.setVisible(False)
+        
         layout.addWidget(analysis_buttons)
         layout.addWidget(self.results_text)
+        layout.addWidget(self.stats_view)
         self.analysis_widget.setLayout(layout)
         
+    def show_result(self, result):
+        """Показывает результат анализа: таблицы в stats_view, текст в results_text"""
+        # Вызывается из слотов сигналов: исключение здесь завершило бы приложение
+        try:
+            if isinstance(result, pd.Series):
+                result = result.to_frame()
+                
+            if isinstance(result, pd.DataFrame):
+                # Индекс (имена колонок, группы) выводим отдельной колонкой
+                model = PandasTableModel(result.reset_index())
+            elif isinstance(result, pl.DataFrame):
+                model = PolarsTableModel(result)
+            else:
+                self.results_text.setText(str(result))
+                self.stats_view.setVisible(False)
+                self.results_text.setVisible(True)
+                return
+                
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка анализа", str(e))
+            return
+            
+        self.stats_view.setModel(model)
+        self.results_text.setVisible(False)
+        self.stats_view.setVisible(True)
+        
     def create_menu(self):
         """Создает меню приложения"""
         menubar = self.menuBar()
@@ -473,6 +663,10 @@ class MainWindow(QMainWindow):
         export_json_action.triggered.connect(lambda: self.export_data('json'))
         export_menu.addAction(export_json_action)
         
+        export_parquet_action = QAction("Экспорт в Parquet", self)
+        export_parquet_action.triggered.connect(lambda: self.export_data('parquet'))
+        export_menu.addAction(export_parquet_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction("Выход", self)
@@ -494,6 +688,12 @@ class MainWindow(QMainWindow):
         )
         data_menu.addAction(convert_polars_action)
         
+        data_menu.addSeparator()
+        
+        downcast_action = QAction("Уменьшить разрядность чисел", self)
+        downcast_action.triggered.connect(self.downcast_data)
+        data_menu.addAction(downcast_action)
+        
         # Меню Настройки
         settings_menu = menubar.addMenu("Настройки")
         
@@ -526,18 +726,14 @@ class MainWindow(QMainWindow):
             self,
             "Выберите файл данных",
             "",
-            "Все файлы (*.*);;CSV (*.csv);;Excel (*.xlsx *.xls);;JSON (*.json);;Parquet (*.parquet)"
+            "Все файлы (*.*);;CSV (*.csv);;Excel (*.xlsx *.xls);;JSON (*.json *.ndjson *.jsonl);;Parquet (*.parquet)"
         )
         
         if file_path:
             self.show_progress("Загрузка данных...")
             
-            # Запускаем в отдельном потоке
-            self.loader_thread = DataLoaderThread(file_path)
-            self.loader_thread.data_loaded.connect(self.on_data_loaded)
-            self.loader_thread.error_occurred.connect(self.on_load_error)
-            self.loader_thread.progress_updated.connect(self.update_progress)
-            self.loader_thread.start()
+            # Запускаем в пуле потоков
+            self.start_loader(DataLoaderWorker(file_path))
             
     def generate_test_data(self):
         """Генерирует тестовые данные"""
@@ -546,18 +742,23 @@ class MainWindow(QMainWindow):
             rows, data_lib = dialog.get_parameters()
             self.show_progress("Генерация тестовых данных...")
             
-            # Запускаем генерацию в отдельном потоке
-            self.loader_thread = DataLoaderThread(None, rows, data_lib)
-            self.loader_thread.data_loaded.connect(self.on_data_loaded)
-            self.loader_thread.error_occurred.connect(self.on_load_error)
-            self.loader_thread.progress_updated.connect(self.update_progress)
-            self.loader_thread.start()
+            # Запускаем генерацию в пуле потоков
+            self.start_loader(DataLoaderWorker(None, rows, data_lib))
             
-    def on_data_loaded(self, result):
+    def start_loader(self, worker):
+        """Подключает сигналы задачи загрузки и запускает ее в общем пуле потоков"""
+        self.loader_worker = worker
+        worker.signals.data_loaded.connect(self.on_data_loaded)
+        worker.signals.error_occurred.connect(self.on_load_error)
+        worker.signals.progress_updated.connect(self.update_progress)
+        QThreadPool.globalInstance().start(worker)
+        
+    def on_data_loaded(self, df, data_lib):
         """Обрабатывает загруженные данные"""
-        df, data_lib = result
         self.current_data = df
         self.current_data_lib = data_lib
+        self._columns = tuple(df.columns)
+        self.reset_analysis_cache()
         
         # Обновляем представление данных
         self.data_view.set_data(df, data_lib)
@@ -566,9 +767,9 @@ class MainWindow(QMainWindow):
         if data_lib == 'polars':
             # Конвертируем в pandas для визуализации
             df_pd = DataConverter.polars_to_pandas(df)
-            self.dashboard.set_data(df_pd)
+            self.dashboard.set_data(df_pd, self._columns)
         else:
-            self.dashboard.set_data(df)
+            self.dashboard.set_data(df, self._columns)
             
         self.hide_progress("Данные успешно загружены")
         
@@ -583,34 +784,54 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Предупреждение", "Нет данных для конвертации")
             return
             
+        if self.current_data_lib == target_lib:
+            self.statusBar().showMessage("Данные уже в указанном формате")
+            return
+            
         self.show_progress(f"Конвертация в {target_lib}...")
         
-        # Используем QTimer для имитации асинхронной операции
-        QTimer.singleShot(100, lambda: self.perform_conversion(target_lib))
+        # Конвертация выполняется в пуле потоков, не блокируя интерфейс
+        self.conversion_worker = ConversionWorker(self.current_data, target_lib)
+        self.conversion_worker.signals.finished.connect(self.on_conversion_done)
+        self.conversion_worker.signals.error.connect(self.on_conversion_error)
+        QThreadPool.globalInstance().start(self.conversion_worker)
         
-    def perform_conversion(self, target_lib):
-        """Выполняет конвертацию данных"""
-        try:
-            if self.current_data_lib == target_lib:
-                self.hide_progress("Данные уже в указанном формате")
-                return
-                
-            if target_lib == 'pandas':
-                df = DataConverter.polars_to_pandas(self.current_data)
-            else:  # polars
-                df = DataConverter.pandas_to_polars(self.current_data)
-                
-            self.current_data = df
-            self.current_data_lib = target_lib
+    def on_conversion_done(self, df, target_lib):
+        """Принимает результат конвертации данных"""
+        self.current_data = df
+        self.current_data_lib = target_lib
+        self._columns = tuple(df.columns)
+        self.reset_analysis_cache()
+        
+        # Обновляем представление
+        self.data_view.set_data(df, target_lib)
+        self.hide_progress(f"Данные конвертированы в {target_lib}")
+        
+    def on_conversion_error(self, error_msg):
+        """Обрабатывает ошибку конвертации"""
+        self.hide_progress("")
+        QMessageBox.critical(self, "Ошибка конвертации", error_msg)
             
-            # Обновляем представление
-            self.data_view.set_data(df, target_lib)
-            self.hide_progress(f"Данные конвертированы в {target_lib}")
+    def downcast_data(self):
+        """Уменьшает разрядность числовых колонок: анализ читает вдвое меньше байт"""
+        if self.current_data is None:
+            QMessageBox.warning(self, "Предупреждение", "Нет данных для преобразования")
+            return
             
+        try:
+            if self.current_data_lib == 'pandas':
+                df = DataConverter.downcast_pandas(self.current_data)
+            else:
+                df = DataConverter.downcast_polars(self.current_data)
         except Exception as e:
-            self.hide_progress("")
-            QMessageBox.critical(self, "Ошибка конвертации", str(e))
+            QMessageBox.critical(self, "Ошибка", str(e))
+            return
             
+        self.current_data = df
+        self.reset_analysis_cache()
+        self.data_view.set_data(df, self.current_data_lib)
+        self.statusBar().showMessage("Разрядность числовых колонок уменьшена")
+        
     def export_data(self, format_type):
         """Экспортирует данные в файл"""
         if self.current_data is None:
@@ -621,38 +842,25 @@ class MainWindow(QMainWindow):
         file_dialog = QFileDialog()
         file_dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
         
-        if format_type == 'csv':
-            file_path, _ = file_dialog.getSaveFileName(
-                self, "Экспорт в CSV", "", "CSV файлы (*.csv)"
-            )
-            ext = '.csv'
-        elif format_type == 'excel':
-            file_path, _ = file_dialog.getSaveFileName(
-                self, "Экспорт в Excel", "", "Excel файлы (*.xlsx)"
-            )
-            ext = '.xlsx'
-        else:  # json
-            file_path, _ = file_dialog.getSaveFileName(
-                self, "Экспорт в JSON", "", "JSON файлы (*.json)"
-            )
-            ext = '.json'
-            
+        title, file_filter, ext = _EXPORT_DIALOGS[format_type]
+        file_path, _ = file_dialog.getSaveFileName(self, title, "", file_filter)
+        
         if file_path:
             if not file_path.endswith(ext):
                 file_path += ext
                 
             self.show_progress(f"Экспорт в {format_type}...")
             
-            # Запускаем экспорт в отдельном потоке
+            # Запускаем экспорт в пуле потоков
             self.export_worker = ExportWorker(
                 self.current_data, 
                 self.current_data_lib,
                 file_path, 
                 format_type
             )
-            self.export_worker.finished.connect(self.on_export_finished)
-            self.export_worker.error.connect(self.on_export_error)
-            self.export_worker.start()
+            self.export_worker.signals.finished.connect(self.on_export_finished)
+            self.export_worker.signals.error.connect(self.on_export_error)
+            QThreadPool.globalInstance().start(self.export_worker)
             
     def on_export_finished(self):
         """Обрабатывает завершение экспорта"""
@@ -670,48 +878,68 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Предупреждение", "Нет данных для анализа")
             return
             
-        try:
-            if self.current_data_lib == 'pandas':
-                result = self.data_processor.analyze_pandas(self.current_data)
-            else:
-                result = self.data_processor.analyze_polars(self.current_data)
-                
-            self.results_text.setText(result)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка анализа", str(e))
+        if self.current_data_lib == 'pandas':
+            self.cached_analysis('analyze', self.data_processor.analyze_pandas)
+        else:
+            self.cached_analysis('analyze', self.data_processor.analyze_polars)
             
+    def cached_analysis(self, name, compute):
+        """Показывает результат анализа текущих данных, вычисляя его один раз"""
+        key = (self._data_generation, name)
+        if key in self._analysis_cache:
+            self.show_result(self._analysis_cache[key])
+            return
+        self.start_analysis(compute, key)
+        
+    def reset_analysis_cache(self):
+        """Сбрасывает результаты анализа и кэши, удерживающие прежние данные"""
+        self._data_generation += 1
+        self._analysis_cache.clear()
+        self.data_processor.clear_caches()
+        
+    def start_analysis(self, compute, key=None):
+        """Запускает анализ в пуле потоков, не блокируя интерфейс"""
+        self.show_progress("Анализ данных...")
+        
+        self.analysis_worker = AnalysisWorker(self.current_data, compute, key)
+        self.analysis_worker.signals.finished.connect(self.on_analysis_done)
+        self.analysis_worker.signals.error.connect(self.on_analysis_error)
+        QThreadPool.globalInstance().start(self.analysis_worker)
+        
+    def on_analysis_done(self, key, result):
+        """Принимает результат анализа"""
+        self.hide_progress("Анализ завершен")
+        if key is not None:
+            # Данные могли смениться, пока шел анализ
+            if key[0] != self._data_generation:
+                return
+            self._analysis_cache[key] = result
+        self.show_result(result)
+        
+    def on_analysis_error(self, error_msg):
+        """Обрабатывает ошибку анализа"""
+        self.hide_progress("")
+        QMessageBox.critical(self, "Ошибка анализа", error_msg)
+        
     def show_correlation(self):
         """Показывает матрицу корреляций"""
         if self.current_data is None:
             return
             
-        try:
-            if self.current_data_lib == 'pandas':
-                corr = self.data_processor.get_correlation_pandas(self.current_data)
-            else:
-                corr = self.data_processor.get_correlation_polars(self.current_data)
-                
-            self.results_text.setText(str(corr))
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
+        if self.current_data_lib == 'pandas':
+            self.cached_analysis('corr', self.data_processor.get_correlation_pandas)
+        else:
+            self.cached_analysis('corr', self.data_processor.get_correlation_polars)
             
     def show_description(self):
         """Показывает статистическое описание"""
         if self.current_data is None:
             return
             
-        try:
-            if self.current_data_lib == 'pandas':
-                desc = self.data_processor.describe_pandas(self.current_data)
-            else:
-                desc = self.data_processor.describe_polars(self.current_data)
-                
-            self.results_text.setText(str(desc))
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", str(e))
+        if self.current_data_lib == 'pandas':
+            self.cached_analysis('describe', self.data_processor.describe_pandas)
+        else:
+            self.cached_analysis('describe', self.data_processor.describe_polars)
             
     def show_groupby(self):
         """Показывает группировку данных"""
@@ -719,24 +947,16 @@ class MainWindow(QMainWindow):
             return
             
         # Диалог для выбора колонок группировки
-        dialog = GroupByDialog(list(self.current_data.columns), self)
+        dialog = GroupByDialog(list(self._columns), self)
         if dialog.exec():
             group_col, agg_col, agg_func = dialog.get_parameters()
             
-            try:
-                if self.current_data_lib == 'pandas':
-                    result = self.data_processor.groupby_pandas(
-                        self.current_data, group_col, agg_col, agg_func
-                    )
-                else:
-                    result = self.data_processor.groupby_polars(
-                        self.current_data, group_col, agg_col, agg_func
-                    )
-                    
-                self.results_text.setText(str(result))
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка группировки", str(e))
+            if self.current_data_lib == 'pandas':
+                groupby = self.data_processor.groupby_pandas
+                self.start_analysis(lambda df: groupby(df, group_col, agg_col, agg_func))
+            else:
+                groupby = self.data_processor.groupby_polars
+                self.start_analysis(lambda df: groupby(df, group_col, agg_col, agg_func).collect())
                 
     def show_progress(self, message):
         """Показывает прогресс бар"""
@@ -818,7 +1038,7 @@ class GroupByDialog(QDialog):
         group_layout = QHBoxLayout()
         group_layout.addWidget(QLabel("Группировать по:"))
         self.group_combo = QComboBox()
-        self.group_combo.addItems(self.columns)
+        self.group_combo.setModel(QStringListModel(self.columns, self))
         group_layout.addWidget(self.group_combo)
         group_layout.addStretch()
         
@@ -826,7 +1046,7 @@ class GroupByDialog(QDialog):
         agg_col_layout = QHBoxLayout()
         agg_col_layout.addWidget(QLabel("Агрегировать:"))
         self.agg_col_combo = QComboBox()
-        self.agg_col_combo.addItems(self.columns)
+        self.agg_col_combo.setModel(QStringListModel(self.columns, self))
         agg_col_layout.addWidget(self.agg_col_combo)
         agg_col_layout.addStretch()
         
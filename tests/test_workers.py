@@ -0,0 +1,55 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+pytest.importorskip("PyQt6")
+
+import workers
+from workers import DataLoaderWorker
+
+
+@pytest.mark.parametrize("data_lib", ["pandas", "polars"])
+def test_test_data_dates_valid_at_dialog_maximum(data_lib, tmp_path, monkeypatch):
+    monkeypatch.setattr(workers, '_TEST_DATA_CACHE_DIR', str(tmp_path))
+    rows = 1_000_000
+    df = DataLoaderWorker(None, rows, data_lib).load_test_data()
+    dates = df['date'].to_numpy()
+    
+    assert len(dates) == rows
+    assert not np.isnat(dates).any()
+    assert (np.diff(dates) < np.timedelta64(0, 'us')).all()
+    # Все даты представимы в datetime64[ns] и datetime Python
+    assert dates.min() > np.datetime64('1678-01-01')
+    assert dates.max() < np.datetime64('2262-01-01')
+    
+    # Повторная загрузка идет из кэша
+    assert len(DataLoaderWorker(None, rows, data_lib).load_test_data()) == rows
+
+
+def test_read_csv_types_change_after_first_block(tmp_path):
+    path = tmp_path / "late_types.csv"
+    # Больше 1 МБ целых чисел, затем дробное значение и пропуск
+    body = "value,label\n" + "1,x\n" * 400_000 + "1.5,y\n,z\n"
+    path.write_text(body)
+    
+    table = DataLoaderWorker(str(path)).read_csv_arrow()
+    
+    assert table.num_rows == 400_002
+    assert pa.types.is_float64(table.schema.field('value').type)
+    assert table.column('value').null_count == 1
+
+
+def test_test_data_cache_is_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(workers, '_TEST_DATA_CACHE_DIR', str(tmp_path))
+    stale = tmp_path / f"testdata_v{workers._TEST_DATA_VERSION - 1}_100_42.parquet"
+    stale.write_bytes(b"")
+    other = tmp_path / "notes.txt"
+    other.write_text("не кэш")
+    
+    for rows in range(100, 100 + workers._TEST_DATA_CACHE_KEEP + 2):
+        DataLoaderWorker(None, rows).load_test_data()
+        
+    cached = sorted(p.name for p in tmp_path.glob("testdata_*"))
+    assert len(cached) == workers._TEST_DATA_CACHE_KEEP
+    assert stale.name not in cached
+    assert other.exists()
@@ -2,11 +2,58 @@
 import pandas as pd
 import polars as pl
 import numpy as np
+import pyarrow as pa
 from datetime import datetime
 import json
+from functools import lru_cache
+import threading
+import weakref
 from PyQt6.QtWidgets import QApplication
 
 
+# Последний классифицированный DataFrame: (слабая ссылка, (числовые, категориальные)).
+# Слабая ссылка не удерживает старые данные в памяти после загрузки новых;
+# анализ идет из пула потоков, поэтому доступ под блокировкой
+_classified = None
+_classified_lock = threading.Lock()
+
+
+def _classify_columns(df):
+    """Возвращает кортежи числовых и категориальных колонок DataFrame"""
+    global _classified
+    with _classified_lock:
+        # Сравнение по идентичности: id() освобожденного DataFrame может повториться
+        if _classified is not None and _classified[0]() is df:
+            return _classified[1]
+            
+    if isinstance(df, pl.DataFrame):
+        schema = df.schema
+        numeric_cols = tuple(col for col, dtype in schema.items() if dtype.is_numeric())
+        cat_cols = tuple(
+            col for col, dtype in schema.items() if dtype == pl.Utf8 or dtype == pl.Categorical
+        )
+    else:
+        numeric_cols = tuple(df.select_dtypes(include=[np.number]).columns)
+        # Строковые и словарные Arrow колонки (чтение через pyarrow) тоже категориальные
+        cat_cols = tuple(
+            col for col, dtype in df.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype)
+            or pd.api.types.is_string_dtype(dtype)
+            or (isinstance(dtype, pd.ArrowDtype) and pa.types.is_dictionary(dtype.pyarrow_dtype))
+        )
+        
+    with _classified_lock:
+        _classified = (weakref.ref(df), (numeric_cols, cat_cols))
+    return numeric_cols, cat_cols
+
+
+@lru_cache(maxsize=64)
+def _agg_expr(agg_col, agg_func):
+    """Выражение агрегации Polars, общее для повторных группировок"""
+    # sum/mean/count/min/max/std - одноименные методы выражения
+    return getattr(pl.col(agg_col), agg_func)().alias(agg_col)
+
+
 class DataProcessor:
     """Обработчик данных для Pandas и Polars"""
     
@@ -25,32 +72,40 @@ class DataProcessor:
         
         # Пропущенные значения
         analysis.append("\n2. ПРОПУЩЕННЫЕ ЗНАЧЕНИЯ:")
-        missing = df.isnull().sum()
+        # Работаем с сырыми массивами, без поиска по индексу Series для каждой колонки
+        missing = df.isna().sum().to_numpy()
         missing_pct = (missing / len(df) * 100).round(2)
-        for col in df.columns:
-            analysis.append(f"   {col}: {missing[col]} ({missing_pct[col]}%)")
+        analysis.extend(
+            f"   {col}: {count} ({pct}%)"
+            for col, count, pct in zip(df.columns, missing, missing_pct)
+        )
             
         # Основные статистики
         analysis.append("\n3. СТАТИСТИКА ДЛЯ ЧИСЛОВЫХ КОЛОНОК:")
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            stats = df[col].describe()
-            analysis.append(f"   {col}:")
-            analysis.append(f"     Мин: {stats['min']:.2f}")
-            analysis.append(f"     Макс: {stats['max']:.2f}")
-            analysis.append(f"     Среднее: {stats['mean']:.2f}")
-            analysis.append(f"     Медиана: {stats['50%']:.2f}")
-            analysis.append(f"     Std: {stats['std']:.2f}")
-            
+        numeric_cols, cat_cols = _classify_columns(df)
+        if numeric_cols:
+            # Один describe() по всем числовым колонкам вместо вызова на каждую
+            desc = df[list(numeric_cols)].describe().T[['min', 'max', 'mean', '50%', 'std']]
+            for col, (min_val, max_val, mean_val, median_val, std_val) in zip(
+                desc.index, desc.itertuples(index=False)
+            ):
+                analysis.append(f"   {col}:")
+                analysis.append(f"     Мин: {min_val:.2f}")
+                analysis.append(f"     Макс: {max_val:.2f}")
+                analysis.append(f"     Среднее: {mean_val:.2f}")
+                analysis.append(f"     Медиана: {median_val:.2f}")
+                analysis.append(f"     Std: {std_val:.2f}")
+                
         # Категориальные колонки
         analysis.append("\n4. КАТЕГОРИАЛЬНЫЕ КОЛОНКИ:")
-        cat_cols = df.select_dtypes(include=['object', 'category']).columns
+        # Число уникальных значений считается для всех колонок сразу
+        unique_counts = df[list(cat_cols)].nunique()
         for col in cat_cols:
-            unique_vals = df[col].nunique()
-            top_vals = df[col].value_counts().head(3)
+            top_vals = df[col].value_counts(sort=True).head(3)
+            top_str = ", ".join(f"{value!r}: {count}" for value, count in top_vals.items())
             analysis.append(f"   {col}:")
-            analysis.append(f"     Уникальных значений: {unique_vals}")
-            analysis.append(f"     Топ-3: {dict(top_vals)}")
+            analysis.append(f"     Уникальных значений: {unique_counts[col]}")
+            analysis.append(f"     Топ-3: {{{top_str}}}")
             
         return "\n".join(analysis)
     
@@ -71,73 +126,89 @@ class DataProcessor:
         for col, dtype in zip(df.columns, df.dtypes):
             analysis.append(f"   {col}: {dtype}")
             
+        numeric_cols, cat_cols = _classify_columns(df)
+        
+        # Все статистики считаются одним ленивым запросом: polars объединяет
+        # проходы по колонкам и выполняет их параллельно
+        exprs = [pl.col(col).null_count().alias(f"nulls_{i}") for i, col in enumerate(df.columns)]
+        for i, col in enumerate(numeric_cols):
+            exprs += [
+                pl.col(col).min().alias(f"min_{i}"),
+                pl.col(col).max().alias(f"max_{i}"),
+                pl.col(col).mean().alias(f"mean_{i}"),
+                pl.col(col).median().alias(f"median_{i}"),
+                pl.col(col).std().alias(f"std_{i}"),
+            ]
+        exprs += [pl.col(col).n_unique().alias(f"unique_{i}") for i, col in enumerate(cat_cols)]
+        stats = df.lazy().select(exprs).collect().row(0, named=True) if exprs else {}
+        
+        # Топ-3 всех категориальных колонок - один запрос: группировки по колонкам
+        # выполняются параллельно, а top_k не сортирует все группы целиком
+        top_vals = {col: {} for col in cat_cols}
+        if cat_cols:
+            top3_df = pl.concat([
+                df.lazy()
+                .group_by(col)
+                .agg(pl.len().alias("n"))
+                .top_k(3, by="n")
+                .sort("n", descending=True)
+                .select(
+                    pl.lit(col).alias("col"),
+                    pl.col(col).cast(pl.Utf8).alias("value"),
+                    pl.col("n"),
+                )
+                for col in cat_cols
+            ]).collect()
+            for col, value, count in top3_df.iter_rows():
+                top_vals[col][value] = count
+        
         # Пропущенные значения
         analysis.append("\n3. ПРОПУЩЕННЫЕ ЗНАЧЕНИЯ:")
-        for col in df.columns:
-            null_count = df[col].null_count()
+        for i, col in enumerate(df.columns):
+            null_count = stats[f"nulls_{i}"]
             null_pct = (null_count / df.height * 100)
             analysis.append(f"   {col}: {null_count} ({null_pct:.2f}%)")
             
         # Основные статистики
         analysis.append("\n4. СТАТИСТИКА ДЛЯ ЧИСЛОВЫХ КОЛОНОК:")
-        numeric_cols = [col for col in df.columns 
-                       if str(df[col].dtype) in ['Int64', 'Int32', 'Int16', 'Int8',
-                                                'UInt64', 'UInt32', 'UInt16', 'UInt8',
-                                                'Float64', 'Float32']]
-        
-        for col in numeric_cols:
-            stats = df[col].describe()
+        for i, col in enumerate(numeric_cols):
             analysis.append(f"   {col}:")
-            analysis.append(f"     Мин: {stats['min'][0]:.2f}")
-            analysis.append(f"     Макс: {stats['max'][0]:.2f}")
-            analysis.append(f"     Среднее: {stats['mean'][0]:.2f}")
-            analysis.append(f"     Медиана: {stats['median'][0]:.2f}")
-            analysis.append(f"     Std: {stats['std'][0]:.2f}")
+            analysis.append(f"     Мин: {stats[f'min_{i}']:.2f}")
+            analysis.append(f"     Макс: {stats[f'max_{i}']:.2f}")
+            analysis.append(f"     Среднее: {stats[f'mean_{i}']:.2f}")
+            analysis.append(f"     Медиана: {stats[f'median_{i}']:.2f}")
+            analysis.append(f"     Std: {stats[f'std_{i}']:.2f}")
             
         # Категориальные колонки
         analysis.append("\n5. КАТЕГОРИАЛЬНЫЕ КОЛОНКИ:")
-        cat_cols = [col for col in df.columns 
-                   if str(df[col].dtype) in ['Utf8', 'Categorical']]
-        
-        for col in cat_cols:
-            unique_vals = df[col].n_unique()
-            value_counts = df[col].value_counts().sort('count', descending=True)
-            top_vals = {row[col]: row['count'] 
-                       for row in value_counts.head(3).to_dicts()}
-            
+        for i, col in enumerate(cat_cols):
             analysis.append(f"   {col}:")
-            analysis.append(f"     Уникальных значений: {unique_vals}")
-            analysis.append(f"     Топ-3: {top_vals}")
+            analysis.append(f"     Уникальных значений: {stats[f'unique_{i}']}")
+            analysis.append(f"     Топ-3: {top_vals[col]}")
             
         return "\n".join(analysis)
     
     @staticmethod
     def get_correlation_pandas(df):
         """Матрица корреляций для Pandas"""
-        numeric_df = df.select_dtypes(include=[np.number])
-        if len(numeric_df.columns) < 2:
+        numeric_cols, _ = _classify_columns(df)
+        if len(numeric_cols) < 2:
             return "Недостаточно числовых колонок для корреляции"
-        return numeric_df.corr()
+        return df[list(numeric_cols)].corr()
     
     @staticmethod
     def get_correlation_polars(df):
         """Матрица корреляций для Polars"""
-        numeric_cols = [col for col in df.columns 
-                       if str(df[col].dtype) in ['Float64', 'Float32', 
-                                                'Int64', 'Int32', 'Int16', 'Int8']]
+        numeric_cols, _ = _classify_columns(df)
+        numeric_cols = list(numeric_cols)
         
         if len(numeric_cols) < 2:
             return "Недостаточно числовых колонок для корреляции"
             
-        # Вычисляем корреляции попарно
-        correlations = []
-        for i, col1 in enumerate(numeric_cols):
-            for col2 in numeric_cols[i+1:]:
-                corr = df[[col1, col2]].corr()
-                if len(corr) > 0:
-                    correlations.append(f"{col1} - {col2}: {corr.row(0)[1]:.3f}")
-                    
-        return "\n".join(correlations) if correlations else "Нет данных"
+        # Вся матрица корреляций считается одним вызовом
+        corr = df.select(numeric_cols).corr()
+        # Первая колонка - имена строк матрицы, как индекс в pandas
+        return pl.concat([pl.DataFrame({"": numeric_cols}), corr], how="horizontal")
     
     @staticmethod
     def describe_pandas(df):
@@ -149,22 +220,47 @@ class DataProcessor:
         """Статистическое описание для Polars"""
         return df.describe()
     
+    # Последний построенный группировщик pandas: (DataFrame, колонка, GroupBy).
+    # GroupBy ссылается на DataFrame, поэтому кэш сбрасывается при смене данных
+    # (clear_caches); группировка идет из пула потоков, отсюда блокировка
+    _grouper_cache = None
+    _grouper_lock = threading.Lock()
+    
+    @staticmethod
+    def clear_caches():
+        """Освобождает кэши, удерживающие прежние данные"""
+        with DataProcessor._grouper_lock:
+            DataProcessor._grouper_cache = None
+            
+    @staticmethod
+    def get_pandas_grouper(df, group_col):
+        """Возвращает GroupBy по колонке, переиспользуя его для того же DataFrame"""
+        with DataProcessor._grouper_lock:
+            cache = DataProcessor._grouper_cache
+            if cache is not None and cache[0] is df and cache[1] == group_col:
+                return cache[2]
+                
+        # observed=True: для категориальных колонок не создаются пустые группы
+        grouper = df.groupby(group_col, observed=True)
+        with DataProcessor._grouper_lock:
+            DataProcessor._grouper_cache = (df, group_col, grouper)
+        return grouper
+    
     @staticmethod
     def groupby_pandas(df, group_col, agg_col, agg_func):
         """Группировка для Pandas"""
+        grouper = DataProcessor.get_pandas_grouper(df, group_col)
         if agg_func == 'count':
-            return df.groupby(group_col)[agg_col].count()
+            return grouper[agg_col].count()
         else:
-            return df.groupby(group_col)[agg_col].agg(agg_func)
+            return grouper[agg_col].agg(agg_func)
     
     @staticmethod
     def groupby_polars(df, group_col, agg_col, agg_func):
-        """Группировка для Polars"""
-        if agg_func == 'count':
-            return df.group_by(group_col).agg(pl.count(agg_col))
-        else:
-            agg_expr = getattr(pl, agg_func)(agg_col)
-            return df.group_by(group_col).agg(agg_expr)
+        """Группировка для Polars: возвращает LazyFrame, который вызывающий
+        может дополнить своими шагами перед collect()"""
+        lf = df if isinstance(df, pl.LazyFrame) else df.lazy()
+        return lf.group_by(group_col).agg(_agg_expr(agg_col, agg_func))
 
 
 class DataConverter:
@@ -173,12 +269,326 @@ class DataConverter:
     @staticmethod
     def pandas_to_polars(df_pd):
         """Конвертирует Pandas DataFrame в Polars"""
-        return pl.from_pandas(df_pd)
+        if len(df_pd.columns) and all(isinstance(dtype, pd.ArrowDtype) for dtype in df_pd.dtypes):
+            # Колонки уже в Arrow: polars использует те же буферы без копирования
+            return pl.from_arrow(pa.Table.from_pandas(df_pd, preserve_index=False))
+        return pl.from_pandas(df_pd, rechunk=False)
     
     @staticmethod
     def polars_to_pandas(df_pl):
         """Конвертирует Polars DataFrame в Pandas"""
-        return df_pl.to_pandas()
+        # Колонки pandas ссылаются на Arrow буферы polars без копирования,
+        # поэтому исходный DataFrame должен жить не меньше результата
+        return df_pl.to_pandas(use_pyarrow_extension_array=True)
+    
+    @staticmethod
+    def downcast_pandas(df):
+        """Уменьшает разрядность числовых колонок Pandas, если значения помещаются"""
+        result = df.copy(deep=False)
+        for col, dtype in df.dtypes.items():
+            if not isinstance(dtype, np.dtype):
+                continue
+            # to_numeric понижает тип, только если значения не искажаются
+            if dtype.kind == 'f':
+                result[col] = pd.to_numeric(df[col], downcast='float')
+            elif dtype.kind == 'i':
+                result[col] = pd.to_numeric(df[col], downcast='integer')
+            elif dtype.kind == 'u':
+                result[col] = pd.to_numeric(df[col], downcast='unsigned')
+        return result
+    
+    @staticmethod
+    def downcast_polars(df):
+        """Приводит Float64 к Float32 и Int64 к Int32 (если значения помещаются)"""
+        schema = df.schema
+        float_cols = [col for col, dtype in schema.items() if dtype == pl.Float64]
+        int_cols = [col for col, dtype in schema.items() if dtype == pl.Int64]
+        casts = []
+        
+        if float_cols or int_cols:
+            # Диапазоны всех числовых колонок одним запросом
+            bounds = df.select(
+                [pl.col(col).abs().max().alias(f"abs_{i}") for i, col in enumerate(float_cols)] +
+                [pl.col(col).min().alias(f"min_{i}") for i, col in enumerate(int_cols)] +
+                [pl.col(col).max().alias(f"max_{i}") for i, col in enumerate(int_cols)]
+            ).row(0)
+            float32_max = np.finfo(np.float32).max
+            for i, col in enumerate(float_cols):
+                # Значения вне диапазона Float32 превратились бы в inf
+                abs_max = bounds[i]
+                if abs_max is None or not np.isfinite(abs_max) or abs_max <= float32_max:
+                    casts.append(pl.col(col).cast(pl.Float32))
+            int_bounds = bounds[len(float_cols):]
+            int32 = np.iinfo(np.int32)
+            for i, col in enumerate(int_cols):
+                min_val, max_val = int_bounds[i], int_bounds[len(int_cols) + i]
+                if min_val is None or (min_val >= int32.min and max_val <= int32.max):
+                    casts.append(pl.col(col).cast(pl.Int32))
+                    
+        return df.with_columns(casts) if casts else df
+    
+    @staticmethod
+    def to_arrow_table(df):
+        """Возвращает Arrow таблицу для Pandas или Polars DataFrame"""
+        if isinstance(df, pl.DataFrame):
+            return df.to_arrow()
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+_LIGHT_QSS = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QWidget {
+        background-color: #f5f5f5;
+        color: #333333;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QTableView {
+        background-color: white;
+        alternate-background-color: #f9f9f9;
+        gridline-color: #e0e0e0;
+        selection-background-color: #2196F3;
+    }
+    QHeaderView::section {
+        background-color: #f0f0f0;
+        padding: 5px;
+        border: 1px solid #e0e0e0;
+        font-weight: bold;
+    }
+    QTabWidget::pane {
+        border: 1px solid #e0e0e0;
+        background-color: white;
+    }
+    QTabBar::tab {
+        background-color: #f0f0f0;
+        padding: 8px 16px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background-color: white;
+        border-bottom-color: white;
+    }
+    QToolBar {
+        background-color: #f8f8f8;
+        border: none;
+        spacing: 5px;
+    }
+    QToolButton {
+        padding: 5px;
+        border-radius: 3px;
+    }
+    QToolButton:hover {
+        background-color: #e0e0e0;
+    }
+    QPushButton {
+        background-color: #2196F3;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #1976D2;
+    }
+    QPushButton:pressed {
+        background-color: #0D47A1;
+    }
+    QComboBox, QLineEdit, QSpinBox, QDoubleSpinBox, QDateEdit {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+        padding: 5px;
+        border-radius: 3px;
+        min-height: 25px;
+    }
+    QMenuBar {
+        background-color: #f8f8f8;
+    }
+    QMenuBar::item:selected {
+        background-color: #e0e0e0;
+    }
+    QMenu {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+    }
+    QMenu::item:selected {
+        background-color: #2196F3;
+        color: white;
+    }
+    QProgressBar {
+        border: 1px solid #e0e0e0;
+        border-radius: 3px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #2196F3;
+    }
+    """
+
+
+_DARK_QSS = """
+    QMainWindow {
+        background-color: #2b2b2b;
+    }
+    QWidget {
+        background-color: #2b2b2b;
+        color: #ffffff;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QTableView {
+        background-color: #3c3c3c;
+        alternate-background-color: #4a4a4a;
+        gridline-color: #555555;
+        selection-background-color: #0078d7;
+    }
+    QHeaderView::section {
+        background-color: #404040;
+        padding: 5px;
+        border: 1px solid #555555;
+        font-weight: bold;
+    }
+    QTabWidget::pane {
+        border: 1px solid #555555;
+        background-color: #3c3c3c;
+    }
+    QTabBar::tab {
+        background-color: #404040;
+        padding: 8px 16px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background-color: #0078d7;
+    }
+    QToolBar {
+        background-color: #404040;
+        border: none;
+        spacing: 5px;
+    }
+    QToolButton {
+        padding: 5px;
+        border-radius: 3px;
+    }
+    QToolButton:hover {
+        background-color: #505050;
+    }
+    QPushButton {
+        background-color: #0078d7;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #106ebe;
+    }
+    QPushButton:pressed {
+        background-color: #005a9e;
+    }
+    QComboBox, QLineEdit, QSpinBox, QDoubleSpinBox, QDateEdit {
+        background-color: #404040;
+        border: 1px solid #555555;
+        padding: 5px;
+        border-radius: 3px;
+        min-height: 25px;
+    }
+    QMenuBar {
+        background-color: #404040;
+    }
+    QMenuBar::item:selected {
+        background-color: #505050;
+    }
+    QMenu {
+        background-color: #404040;
+        border: 1px solid #555555;
+    }
+    QMenu::item:selected {
+        background-color: #0078d7;
+    }
+    QProgressBar {
+        border: 1px solid #555555;
+        border-radius: 3px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #0078d7;
+    }
+    """
+
+
+_BLUE_QSS = """
+    QMainWindow {
+        background-color: #f0f8ff;
+    }
+    QWidget {
+        background-color: #f0f8ff;
+        color: #003366;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QTableView {
+        background-color: white;
+        alternate-background-color: #f0f8ff;
+        gridline-color: #cce0ff;
+        selection-background-color: #3399ff;
+    }
+    QHeaderView::section {
+        background-color: #66b3ff;
+        color: white;
+        padding: 5px;
+        border: 1px solid #3399ff;
+        font-weight: bold;
+    }
+    QTabWidget::pane {
+        border: 2px solid #66b3ff;
+        background-color: white;
+        border-radius: 5px;
+    }
+    QTabBar::tab {
+        background-color: #cce0ff;
+        color: #003366;
+        padding: 8px 16px;
+        margin-right: 2px;
+        border-top-left-radius: 5px;
+        border-top-right-radius: 5px;
+    }
+    QTabBar::tab:selected {
+        background-color: #66b3ff;
+        color: white;
+        font-weight: bold;
+    }
+    QToolBar {
+        background-color: #66b3ff;
+        border: none;
+        spacing: 5px;
+    }
+    QToolButton {
+        padding: 5px;
+        border-radius: 3px;
+        background-color: #99ccff;
+    }
+    QToolButton:hover {
+        background-color: #3399ff;
+    }
+    QPushButton {
+        background-color: #0066cc;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #004d99;
+    }
+    QPushButton:pressed {
+        background-color: #003366;
+    }
+    """
+
+
+# Таблицы стилей собираются один раз при импорте
+_THEMES = {'light': _LIGHT_QSS, 'dark': _DARK_QSS, 'blue': _BLUE_QSS}
 
 
 class StyleManager:
@@ -187,256 +597,4 @@ class StyleManager:
     @staticmethod
     def apply_style(widget, theme='light'):
         """Применяет тему к приложению"""
-        if theme == 'dark':
-            style = """
-            QMainWindow {
-                background-color: #2b2b2b;
-            }
-            QWidget {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QTableView {
-                background-color: #3c3c3c;
-                alternate-background-color: #4a4a4a;
-                gridline-color: #555555;
-                selection-background-color: #0078d7;
-            }
-            QHeaderView::section {
-                background-color: #404040;
-                padding: 5px;
-                border: 1px solid #555555;
-                font-weight: bold;
-            }
-            QTabWidget::pane {
-                border: 1px solid #555555;
-                background-color: #3c3c3c;
-            }
-            QTabBar::tab {
-                background-color: #404040;
-                padding: 8px 16px;
-                margin-right: 2px;
-            }
-            QTabBar::tab:selected {
-                background-color: #0078d7;
-            }
-            QToolBar {
-                background-color: #404040;
-                border: none;
-                spacing: 5px;
-            }
-            QToolButton {
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QToolButton:hover {
-                background-color: #505050;
-            }
-            QPushButton {
-                background-color: #0078d7;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            QComboBox, QLineEdit, QSpinBox, QDoubleSpinBox, QDateEdit {
-                background-color: #404040;
-                border: 1px solid #555555;
-                padding: 5px;
-                border-radius: 3px;
-                min-height: 25px;
-            }
-            QMenuBar {
-                background-color: #404040;
-            }
-            QMenuBar::item:selected {
-                background-color: #505050;
-            }
-            QMenu {
-                background-color: #404040;
-                border: 1px solid #555555;
-            }
-            QMenu::item:selected {
-                background-color: #0078d7;
-            }
-            QProgressBar {
-                border: 1px solid #555555;
-                border-radius: 3px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d7;
-            }
-            """
-            
-        elif theme == 'blue':
-            style = """
-            QMainWindow {
-                background-color: #f0f8ff;
-            }
-            QWidget {
-                background-color: #f0f8ff;
-                color: #003366;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QTableView {
-                background-color: white;
-                alternate-background-color: #f0f8ff;
-                gridline-color: #cce0ff;
-                selection-background-color: #3399ff;
-            }
-            QHeaderView::section {
-                background-color: #66b3ff;
-                color: white;
-                padding: 5px;
-                border: 1px solid #3399ff;
-                font-weight: bold;
-            }
-            QTabWidget::pane {
-                border: 2px solid #66b3ff;
-                background-color: white;
-                border-radius: 5px;
-            }
-            QTabBar::tab {
-                background-color: #cce0ff;
-                color: #003366;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-top-left-radius: 5px;
-                border-top-right-radius: 5px;
-            }
-            QTabBar::tab:selected {
-                background-color: #66b3ff;
-                color: white;
-                font-weight: bold;
-            }
-            QToolBar {
-                background-color: #66b3ff;
-                border: none;
-                spacing: 5px;
-            }
-            QToolButton {
-                padding: 5px;
-                border-radius: 3px;
-                background-color: #99ccff;
-            }
-            QToolButton:hover {
-                background-color: #3399ff;
-            }
-            QPushButton {
-                background-color: #0066cc;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #004d99;
-            }
-            QPushButton:pressed {
-                background-color: #003366;
-            }
-            """
-            
-        else:  # light theme
-            style = """
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QWidget {
-                background-color: #f5f5f5;
-                color: #333333;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QTableView {
-                background-color: white;
-                alternate-background-color: #f9f9f9;
-                gridline-color: #e0e0e0;
-                selection-background-color: #2196F3;
-            }
-            QHeaderView::section {
-                background-color: #f0f0f0;
-                padding: 5px;
-                border: 1px solid #e0e0e0;
-                font-weight: bold;
-            }
-            QTabWidget::pane {
-                border: 1px solid #e0e0e0;
-                background-color: white;
-            }
-            QTabBar::tab {
-                background-color: #f0f0f0;
-                padding: 8px 16px;
-                margin-right: 2px;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                border-bottom-color: white;
-            }
-            QToolBar {
-                background-color: #f8f8f8;
-                border: none;
-                spacing: 5px;
-            }
-            QToolButton {
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QToolButton:hover {
-                background-color: #e0e0e0;
-            }
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-            QPushButton:pressed {
-                background-color: #0D47A1;
-            }
-            QComboBox, QLineEdit, QSpinBox, QDoubleSpinBox, QDateEdit {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                padding: 5px;
-                border-radius: 3px;
-                min-height: 25px;
-            }
-            QMenuBar {
-                background-color: #f8f8f8;
-            }
-            QMenuBar::item:selected {
-                background-color: #e0e0e0;
-            }
-            QMenu {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-            }
-            QMenu::item:selected {
-                background-color: #2196F3;
-                color: white;
-            }
-            QProgressBar {
-                border: 1px solid #e0e0e0;
-                border-radius: 3px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #2196F3;
-            }
-            """
-            
-        widget.setStyleSheet(style)
\ No newline at end of file
+        widget.setStyleSheet(_THEMES.get(theme, _LIGHT_QSS))
\ No newline at end of file
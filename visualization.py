@@ -14,11 +14,99 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pyqtgraph as pg
 import pandas as pd
+import pyarrow as pa
 import numpy as np
 import tempfile
 import os
 
 
+def _is_categorical(series):
+    """Проверяет, является ли колонка категориальной (строки или category)"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype):
+        # Строковые и категориальные колонки после конвертации из polars хранятся в Arrow
+        return pd.api.types.is_string_dtype(dtype) or pa.types.is_dictionary(dtype.pyarrow_dtype)
+    return dtype == object or isinstance(dtype, pd.CategoricalDtype)
+
+
+def _plot_line_mpl(widget, ax, data, x_col, y_col):
+    line, = ax.plot(data[x_col], data[y_col], marker='o', linestyle='-')
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    ax.set_title(f"Линейный график: {y_col} по {x_col}")
+    ax.grid(True, alpha=0.3)
+    return line
+    
+    
+def _plot_bar_mpl(widget, ax, data, x_col, y_col):
+    # Для столбчатой диаграммы группируем по x_col
+    if _is_categorical(data[x_col]):
+        # Группировка по целочисленным кодам категорий
+        x_cat = widget.get_categorical(data, x_col)
+        grouped = data.groupby(x_cat, observed=True, sort=False)[y_col].agg('mean')
+        ax.bar(grouped.index, grouped.values)
+        ax.set_xlabel(x_col)
+        ax.set_ylabel(f"Среднее {y_col}")
+        ax.set_title(f"Столбчатая диаграмма: {y_col} по {x_col}")
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        
+        
+def _plot_pie_mpl(widget, ax, data, x_col, y_col):
+    if _is_categorical(data[x_col]):
+        x_cat = widget.get_categorical(data, x_col)
+        grouped = data.groupby(x_cat, observed=True, sort=False)[y_col].agg('sum')
+        ax.pie(grouped.values, labels=grouped.index, autopct='%1.1f%%')
+        ax.set_title(f"Круговая диаграмма: {y_col} по {x_col}")
+        
+        
+def _plot_scatter_mpl(widget, ax, data, x_col, y_col):
+    points = ax.scatter(data[x_col], data[y_col], alpha=0.5)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    ax.set_title(f"Точечная диаграмма: {y_col} vs {x_col}")
+    ax.grid(True, alpha=0.3)
+    return points
+    
+    
+def _plot_hist_mpl(widget, ax, data, x_col, y_col):
+    ax.hist(data[y_col], bins=30, alpha=0.7, edgecolor='black')
+    ax.set_xlabel(y_col)
+    ax.set_ylabel('Частота')
+    ax.set_title(f"Гистограмма распределения {y_col}")
+    ax.grid(True, alpha=0.3)
+    
+    
+# Обработчики Matplotlib по типу графика: один поиск в словаре вместо цепочки if/elif
+_MPL_HANDLERS = {
+    "Линейный график": _plot_line_mpl,
+    "Столбчатая диаграмма": _plot_bar_mpl,
+    "Круговая диаграмма": _plot_pie_mpl,
+    "Точечная диаграмма": _plot_scatter_mpl,
+    "Гистограмма": _plot_hist_mpl,
+}
+
+
+def _update_line_mpl(line, ax, data, x_col, y_col):
+    line.set_data(data[x_col], data[y_col])
+    ax.relim()
+    
+    
+def _update_scatter_mpl(points, ax, data, x_col, y_col):
+    offsets = np.column_stack([ax.convert_xunits(data[x_col].to_numpy()),
+                               ax.convert_yunits(data[y_col].to_numpy())])
+    points.set_offsets(offsets)
+    # relim() не учитывает коллекции, поэтому границы задаем сами
+    ax.ignore_existing_data_limits = True
+    ax.update_datalim(offsets)
+    
+    
+# Обновление уже нарисованного графика без пересоздания осей
+_MPL_UPDATERS = {
+    "Линейный график": _update_line_mpl,
+    "Точечная диаграмма": _update_scatter_mpl,
+}
+
+
 class MatplotlibWidget(QWidget):
     """Виджет для Matplotlib графиков"""
     
@@ -33,50 +121,51 @@ class MatplotlibWidget(QWidget):
         layout.addWidget(self.canvas)
         self.setLayout(layout)
         
+        # Категориальная колонка для группировки: (данные, имя колонки, Series)
+        self._cat_cache = None
+        
+        # Оси и основной объект текущего графика для повторной отрисовки
+        self._ax = None
+        self._artist = None
+        self._chart_key = None
+        
+    def get_categorical(self, data, col):
+        """Возвращает колонку как category, переиспользуя ее для тех же данных"""
+        cache = self._cat_cache
+        # Сравнение по идентичности: id() освобожденного DataFrame может повториться
+        if cache is not None and cache[0] is data and cache[1] == col:
+            return cache[2]
+            
+        series = data[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        self._cat_cache = (data, col, series)
+        return series
+        
     def update_chart(self, data, chart_type, x_col, y_col):
         """Обновляет график"""
+        key = (chart_type, x_col, y_col)
+        updater = _MPL_UPDATERS.get(chart_type)
+        if self._artist is not None and self._chart_key == key and updater is not None:
+            # Тот же график: меняем только данные существующего объекта
+            try:
+                updater(self._artist, self._ax, data, x_col, y_col)
+                self._ax.autoscale_view()
+                self.canvas.draw_idle()
+                return
+            except Exception:
+                pass  # перестраиваем график целиком
+                
         self.figure.clear()
         ax = self.figure.add_subplot(111)
+        self._ax = ax
+        self._artist = None
+        self._chart_key = key
         
         try:
-            if chart_type == "Линейный график":
-                ax.plot(data[x_col], data[y_col], marker='o', linestyle='-')
-                ax.set_xlabel(x_col)
-                ax.set_ylabel(y_col)
-                ax.set_title(f"Линейный график: {y_col} по {x_col}")
-                ax.grid(True, alpha=0.3)
-                
-            elif chart_type == "Столбчатая диаграмма":
-                # Для столбчатой диаграммы группируем по x_col
-                if data[x_col].dtype in ['object', 'category']:
-                    grouped = data.groupby(x_col)[y_col].mean()
-                    x = grouped.index
-                    y = grouped.values
-                    ax.bar(x, y)
-                    ax.set_xlabel(x_col)
-                    ax.set_ylabel(f"Среднее {y_col}")
-                    ax.set_title(f"Столбчатая диаграмма: {y_col} по {x_col}")
-                    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-                    
-            elif chart_type == "Круговая диаграмма":
-                if data[x_col].dtype in ['object', 'category']:
-                    grouped = data.groupby(x_col)[y_col].sum()
-                    ax.pie(grouped.values, labels=grouped.index, autopct='%1.1f%%')
-                    ax.set_title(f"Круговая диаграмма: {y_col} по {x_col}")
-                    
-            elif chart_type == "Точечная диаграмма":
-                ax.scatter(data[x_col], data[y_col], alpha=0.5)
-                ax.set_xlabel(x_col)
-                ax.set_ylabel(y_col)
-                ax.set_title(f"Точечная диаграмма: {y_col} vs {x_col}")
-                ax.grid(True, alpha=0.3)
-                
-            elif chart_type == "Гистограмма":
-                ax.hist(data[y_col], bins=30, alpha=0.7, edgecolor='black')
-                ax.set_xlabel(y_col)
-                ax.set_ylabel('Частота')
-                ax.set_title(f"Гистограмма распределения {y_col}")
-                ax.grid(True, alpha=0.3)
+            handler = _MPL_HANDLERS.get(chart_type)
+            if handler is not None:
+                self._artist = handler(self, ax, data, x_col, y_col)
                 
             self.figure.tight_layout()
             self.canvas.draw()
@@ -92,49 +181,65 @@ class MatplotlibWidget(QWidget):
 class PlotlyWidget(QWebEngineView):
     """Виджет для Plotly графиков"""
     
+    # setHtml() ограничен 2 МБ; графики крупнее загружаются из файла
+    HTML_SIZE_LIMIT = 2 * 1024 * 1024
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.temp_files = []
+        # Временный файл нужен только для графиков больше HTML_SIZE_LIMIT
+        self.temp_file = None
         
     def set_figure(self, fig):
         """Устанавливает Plotly график"""
-        # Удаляем старые временные файлы
-        for temp_file in self.temp_files:
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
-                
-        self.temp_files.clear()
-        
-        # Создаем временный HTML файл
-        temp_file = tempfile.NamedTemporaryFile(
-            mode='w', suffix='.html', delete=False, encoding='utf-8'
-        )
-        fig.write_html(temp_file.name, include_plotlyjs='cdn')
-        temp_file.close()
+        html = fig.to_html(include_plotlyjs='cdn', full_html=True)
+        html_bytes = html.encode('utf-8')
         
-        self.temp_files.append(temp_file.name)
-        
-        # Загружаем HTML в WebEngineView
-        self.load(QUrl.fromLocalFile(temp_file.name))
+        if len(html_bytes) < self.HTML_SIZE_LIMIT:
+            # HTML передается из памяти, без записи на диск
+            self.setHtml(html, QUrl("https://cdn.plot.ly/"))
+            return
+            
+        # Один временный файл перезаписывается при каждом обновлении
+        if self.temp_file is None:
+            fd, self.temp_file = tempfile.mkstemp(suffix='.html')
+            os.close(fd)
+        with open(self.temp_file, 'wb') as f:
+            f.write(html_bytes)
+        self.load(QUrl.fromLocalFile(self.temp_file))
         
     def cleanup(self):
         """Очищает временные файлы"""
-        for temp_file in self.temp_files:
+        if self.temp_file is not None:
             try:
-                os.unlink(temp_file)
-            except:
+                os.unlink(self.temp_file)
+            except OSError:
                 pass
+            self.temp_file = None
 
 
 class PyQtGraphWidget(QWidget):
     """Виджет для PyQtGraph (режим реального времени)"""
     
+    # Начальная емкость буферов точек графика
+    MIN_CAPACITY = 1024
+    # Виды колонки X, к которым можно дописывать точки: числа и даты
+    REALTIME_X_KINDS = 'iufM'
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
         self.data = None
+        # Точки графика в заранее выделенных буферах: новые точки
+        # дописываются в конец без копирования всех данных
+        self._x = None
+        self._y = None
+        self._n = 0
+        # Линия графика, обновляемая через setData
+        self._curve = None
+        # Онлайн-статистики значений (алгоритм Уэлфорда) для генерации точек
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
         
     def init_ui(self):
         layout = QVBoxLayout()
@@ -178,34 +283,115 @@ class PyQtGraphWidget(QWidget):
         self.y_col = y_col
         
         self.plot_widget.clear()
+        # Точки прошлого графика не должны дорисовываться поверх нового
+        self.clear_buffers()
         
         try:
+            y = data[y_col].to_numpy(dtype=np.float64, na_value=np.nan)
+            
             if chart_type in ["Линейный график", "Точечная диаграмма"]:
-                x = data[x_col].values
-                y = data[y_col].values
+                x = data[x_col].to_numpy()
+                if x.dtype.kind not in self.REALTIME_X_KINDS:
+                    self.stop_realtime()
+                    self.plot_widget.setTitle(f"{chart_type}: колонка {x_col} не числовая")
+                    return
+                self.reset_buffers(x, y)
+                x = self._x[:self._n]
+                y = self._y[:self._n]
                 
                 if chart_type == "Линейный график":
-                    self.plot_widget.plot(x, y, pen=pg.mkPen('b', width=2), 
-                                         symbol='o', symbolSize=5)
+                    self._curve = self.plot_widget.plot(x, y, pen=pg.mkPen('b', width=2), 
+                                                        symbol='o', symbolSize=5)
                 else:  # Точечная диаграмма
-                    self.plot_widget.plot(x, y, pen=None, 
-                                         symbol='o', symbolSize=5)
+                    self._curve = self.plot_widget.plot(x, y, pen=None, 
+                                                        symbol='o', symbolSize=5)
                                          
                 self.plot_widget.setLabel('bottom', x_col)
                 self.plot_widget.setLabel('left', y_col)
                 self.plot_widget.setTitle(f"{chart_type}: {y_col} по {x_col}")
                 
             elif chart_type == "Гистограмма":
-                y, x = np.histogram(data[y_col].dropna().values, bins=30)
-                self.plot_widget.plot(x, y, stepMode=True, fillLevel=0, 
-                                     brush=(0, 0, 255, 150))
+                self.reset_buffers(None, y)
+                self.draw_histogram()
                 self.plot_widget.setLabel('bottom', y_col)
                 self.plot_widget.setLabel('left', 'Частота')
                 self.plot_widget.setTitle(f"Гистограмма: {y_col}")
                 
+            else:
+                # Остальные типы графиков не поддерживают режим реального времени
+                self.stop_realtime()
+                
         except Exception as e:
+            self.clear_buffers()
+            self.stop_realtime()
             print(f"Ошибка PyQtGraph: {e}")
             
+    def clear_buffers(self):
+        """Сбрасывает точки и линию текущего графика"""
+        self._x = None
+        self._y = None
+        self._n = 0
+        self._curve = None
+        
+    def stop_realtime(self):
+        """Выключает режим реального времени"""
+        self.timer.stop()
+        self.realtime_check.setChecked(False)
+        
+    def reset_buffers(self, x, y):
+        """Копирует точки в буферы с запасом емкости"""
+        self._n = len(y)
+        capacity = max(2 * self._n, self.MIN_CAPACITY)
+        self._y = np.empty(capacity, dtype=np.float64)
+        self._y[:self._n] = y
+        if x is None:
+            self._x = None
+        else:
+            self._x = np.empty(capacity, dtype=x.dtype)
+            self._x[:self._n] = x
+            
+        # Статистики считаются по данным один раз, дальше обновляются по точкам
+        valid = ~np.isnan(y)
+        self._has_nan = not valid.all()
+        values = y[valid] if self._has_nan else y
+        self._count = len(values)
+        self._mean = float(values.mean()) if self._count else 0.0
+        self._m2 = float(((values - self._mean) ** 2).sum())
+        # Границы гистограммы: np.histogram не делает свой проход min/max
+        self._lo = float(values.min()) if self._count else np.inf
+        self._hi = float(values.max()) if self._count else -np.inf
+        
+    def append_point(self, new_x, new_y):
+        """Дописывает точку в буферы, удваивая емкость при заполнении"""
+        if self._n == len(self._y):
+            self._y = np.concatenate([self._y, np.empty_like(self._y)])
+            if self._x is not None:
+                self._x = np.concatenate([self._x, np.empty_like(self._x)])
+                
+        self._y[self._n] = new_y
+        if self._x is not None:
+            self._x[self._n] = new_x
+        self._n += 1
+        
+        # Шаг алгоритма Уэлфорда: O(1) вместо пересчета по всем точкам
+        self._count += 1
+        delta = new_y - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (new_y - self._mean)
+        self._lo = min(self._lo, new_y)
+        self._hi = max(self._hi, new_y)
+        
+    def draw_histogram(self):
+        """Строит гистограмму по значениям из буфера"""
+        values = self._y[:self._n]
+        if self._has_nan:
+            values = values[~np.isnan(values)]
+        hist_range = (self._lo, self._hi) if self._count else None
+        y, x = np.histogram(values, bins=30, range=hist_range)
+        self.plot_widget.clear()
+        self.plot_widget.plot(x, y, stepMode=True, fillLevel=0, 
+                              brush=(0, 0, 255, 150))
+                              
     def toggle_realtime(self, state):
         """Включает/выключает режим реального времени"""
         if state == Qt.CheckState.Checked.value:
@@ -215,32 +401,75 @@ class PyQtGraphWidget(QWidget):
             
     def update_realtime_data(self):
         """Обновляет данные в реальном времени"""
-        if self.data is not None and hasattr(self, 'chart_type'):
-            # Добавляем новые случайные точки
-            new_data = self.data.copy()
+        if self._y is None or self._n == 0:
+            return
             
-            if hasattr(new_data, 'to_pandas'):
-                new_data = new_data.to_pandas()
-                
-            # Добавляем случайные данные
-            last_x = new_data[self.x_col].iloc[-1]
-            if isinstance(last_x, (pd.Timestamp, np.datetime64)):
-                new_x = last_x + pd.Timedelta(hours=1)
+        # Добавляем случайную точку с распределением текущих данных
+        std = np.sqrt(self._m2 / (self._count - 1)) if self._count > 1 else 0.0
+        new_y = np.random.normal(self._mean, std)
+        
+        new_x = None
+        if self._x is not None:
+            last_x = self._x[self._n - 1]
+            if np.issubdtype(self._x.dtype, np.datetime64):
+                new_x = last_x + np.timedelta64(1, 'h')
             else:
                 new_x = last_x + 1
                 
-            new_y = np.random.normal(
-                new_data[self.y_col].mean(),
-                new_data[self.y_col].std()
-            )
-            
-            # Добавляем новую точку
-            new_row = {self.x_col: new_x, self.y_col: new_y}
-            new_data = pd.concat([new_data, pd.DataFrame([new_row])], ignore_index=True)
-            
-            # Обновляем график
-            self.update_chart(new_data, self.chart_type, self.x_col, self.y_col)
-            self.data = new_data
+        self.append_point(new_x, new_y)
+        
+        # Обновляем существующую линию вместо полной перерисовки
+        if self._curve is not None:
+            self._curve.setData(self._x[:self._n], self._y[:self._n])
+        else:
+            self.draw_histogram()
+
+
+def _plot_line_plotly(data, x_col, y_col):
+    return px.line(data, x=x_col, y=y_col,
+                   title=f"Линейный график: {y_col} по {x_col}")
+    
+    
+def _plot_bar_plotly(data, x_col, y_col):
+    if _is_categorical(data[x_col]):
+        grouped = data.groupby(x_col)[y_col].mean().reset_index()
+        return px.bar(grouped, x=x_col, y=y_col,
+                      title=f"Столбчатая диаграмма: {y_col} по {x_col}")
+    return px.histogram(data, x=x_col, y=y_col, histfunc='avg',
+                        title=f"Столбчатая диаграмма: {y_col} по {x_col}")
+    
+    
+def _plot_pie_plotly(data, x_col, y_col):
+    if _is_categorical(data[x_col]):
+        grouped = data.groupby(x_col)[y_col].sum().reset_index()
+        return px.pie(grouped, values=y_col, names=x_col,
+                      title=f"Круговая диаграмма: {y_col} по {x_col}")
+    return px.pie(data, values=y_col, names=x_col,
+                  title=f"Круговая диаграмма: {y_col} по {x_col}")
+    
+    
+def _plot_scatter_plotly(data, x_col, y_col):
+    return px.scatter(data, x=x_col, y=y_col,
+                      title=f"Точечная диаграмма: {y_col} vs {x_col}")
+    
+    
+def _plot_hist_plotly(data, x_col, y_col):
+    return px.histogram(data, x=y_col,
+                        title=f"Гистограмма распределения {y_col}")
+    
+    
+def _plot_default_plotly(data, x_col, y_col):
+    return px.scatter(data, x=x_col, y=y_col)
+    
+    
+# Обработчики Plotly по типу графика
+_PLOTLY_HANDLERS = {
+    "Линейный график": _plot_line_plotly,
+    "Столбчатая диаграмма": _plot_bar_plotly,
+    "Круговая диаграмма": _plot_pie_plotly,
+    "Точечная диаграмма": _plot_scatter_plotly,
+    "Гистограмма": _plot_hist_plotly,
+}
 
 
 def create_plotly_figure(data, chart_type, x_col, y_col):
@@ -249,39 +478,8 @@ def create_plotly_figure(data, chart_type, x_col, y_col):
         data = data.to_pandas()
         
     try:
-        if chart_type == "Линейный график":
-            fig = px.line(data, x=x_col, y=y_col, 
-                         title=f"Линейный график: {y_col} по {x_col}")
-            
-        elif chart_type == "Столбчатая диаграмма":
-            if data[x_col].dtype in ['object', 'category']:
-                grouped = data.groupby(x_col)[y_col].mean().reset_index()
-                fig = px.bar(grouped, x=x_col, y=y_col,
-                           title=f"Столбчатая диаграмма: {y_col} по {x_col}")
-            else:
-                fig = px.histogram(data, x=x_col, y=y_col, histfunc='avg',
-                                 title=f"Столбчатая диаграмма: {y_col} по {x_col}")
-                
-        elif chart_type == "Круговая диаграмма":
-            if data[x_col].dtype in ['object', 'category']:
-                grouped = data.groupby(x_col)[y_col].sum().reset_index()
-                fig = px.pie(grouped, values=y_col, names=x_col,
-                           title=f"Круговая диаграмма: {y_col} по {x_col}")
-            else:
-                fig = px.pie(data, values=y_col, names=x_col,
-                           title=f"Круговая диаграмма: {y_col} по {x_col}")
-                           
-        elif chart_type == "Точечная диаграмма":
-            fig = px.scatter(data, x=x_col, y=y_col,
-                           title=f"Точечная диаграмма: {y_col} vs {x_col}")
-            
-        elif chart_type == "Гистограмма":
-            fig = px.histogram(data, x=y_col,
-                             title=f"Гистограмма распределения {y_col}")
-            
-        else:
-            fig = px.scatter(data, x=x_col, y=y_col)
-            
+        fig = _PLOTLY_HANDLERS.get(chart_type, _plot_default_plotly)(data, x_col, y_col)
+        
         fig.update_layout(
             template="plotly_white",
             hovermode="closest"
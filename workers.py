@@ -3,18 +3,62 @@ from PyQt6.QtCore import *
 import pandas as pd
 import polars as pl
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from datetime import datetime
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from openpyxl import Workbook
 
+from utils import DataConverter
 
-class DataLoaderThread(QThread):
-    """Поток для загрузки данных"""
-    data_loaded = pyqtSignal(tuple)  # (dataframe, data_lib)
+
+# Тестовые данные детерминированы зерном и кэшируются в Parquet.
+# Версию нужно увеличивать при любом изменении генератора или схемы
+_TEST_DATA_SEED = 42
+_TEST_DATA_VERSION = 3
+_TEST_DATA_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'bisys')
+# Сколько наборов тестовых данных (разное число строк) хранится в кэше
+_TEST_DATA_CACHE_KEEP = 4
+# Наибольший разброс дат тестовых данных: даты остаются в диапазоне
+# datetime64[ns] (1677-2262) и datetime Python при любом числе строк
+_TEST_DATA_DATE_SPAN = np.timedelta64(100_000, 'D').astype('timedelta64[us]')
+
+# Значения категориальных колонок тестовых данных
+_CATEGORIES = ['A', 'B', 'C', 'D']
+_REGIONS = ['North', 'South', 'East', 'West']
+
+# Генераторы случайных колонок: (имя, функция(rng, rows)), порядок задает порядок колонок
+_RANDOM_COLUMNS = (
+    ('category', lambda rng, rows: rng.integers(0, 4, rows, dtype=np.int8)),
+    # int32 вдвое сокращает объем по сравнению с int64 по умолчанию
+    ('value_int', lambda rng, rows: rng.integers(1, 1000, rows, dtype=np.int32)),
+    ('value_float', lambda rng, rows: rng.uniform(0, 1000, rows)),
+    ('sales', lambda rng, rows: rng.exponential(100, rows)),
+    ('profit', lambda rng, rows: rng.normal(500, 200, rows)),
+    ('region', lambda rng, rows: rng.integers(0, 4, rows, dtype=np.int8)),
+    # Байты 0/1 читаются как bool без копирования
+    ('active', lambda rng, rows: rng.integers(0, 2, rows, dtype=np.uint8).view(bool)),
+    ('score', lambda rng, rows: rng.integers(1, 101, rows, dtype=np.int32)),
+)
+
+
+class LoaderSignals(QObject):
+    """Сигналы задачи загрузки данных"""
+    # Сигнал передает ссылку на объект внутри процесса: данные не копируются
+    data_loaded = pyqtSignal(object, str)  # (dataframe, data_lib)
     error_occurred = pyqtSignal(str)
     progress_updated = pyqtSignal(int)
+
+
+class DataLoaderWorker(QRunnable):
+    """Задача пула потоков для загрузки данных"""
     
     def __init__(self, file_path=None, rows=10000, data_lib='pandas'):
         super().__init__()
+        self.signals = LoaderSignals()
         self.file_path = file_path
         self.rows = rows
         self.data_lib = data_lib
@@ -23,84 +67,280 @@ class DataLoaderThread(QThread):
         try:
             if self.file_path:
                 # Загрузка из файла
-                self.progress_updated.emit(10)
+                self.signals.progress_updated.emit(10)
+                
+                # Формат файла с неизвестным расширением определяется по сигнатуре
+                ext = os.path.splitext(self.file_path)[1].lower()
+                reader = self._READERS.get(ext, DataLoaderWorker.read_unknown)
+                df = reader(self)
                 
-                if self.file_path.endswith('.csv'):
-                    if self.data_lib == 'pandas':
-                        df = pd.read_csv(self.file_path)
-                    else:
-                        df = pl.read_csv(self.file_path)
-                        
-                elif self.file_path.endswith('.parquet'):
-                    if self.data_lib == 'pandas':
-                        df = pd.read_parquet(self.file_path)
-                    else:
-                        df = pl.read_parquet(self.file_path)
-                        
-                elif self.file_path.endswith(('.xlsx', '.xls')):
-                    # Excel поддерживается только pandas
-                    df = pd.read_excel(self.file_path)
-                    if self.data_lib == 'polars':
-                        df = pl.from_pandas(df)
-                        
-                elif self.file_path.endswith('.json'):
-                    if self.data_lib == 'pandas':
-                        df = pd.read_json(self.file_path)
-                    else:
-                        df = pl.read_json(self.file_path)
-                        
-                else:
-                    # Пробуем загрузить как CSV
-                    if self.data_lib == 'pandas':
-                        df = pd.read_csv(self.file_path)
-                    else:
-                        df = pl.read_csv(self.file_path)
-                        
             else:
                 # Генерация тестовых данных
-                df = self.generate_test_data()
+                df = self.load_test_data()
                 
-            self.progress_updated.emit(100)
-            self.data_loaded.emit((df, self.data_lib))
+            self.signals.progress_updated.emit(100)
+            self.signals.data_loaded.emit(df, self.data_lib)
             
         except Exception as e:
-            self.error_occurred.emit(f"Ошибка загрузки: {str(e)}")
+            self.signals.error_occurred.emit(f"Ошибка загрузки: {str(e)}")
             
-    def generate_test_data(self):
-        """Генерирует тестовые данные"""
-        np.random.seed(42)
-        
-        # Генерируем даты
-        dates = [datetime.now() - timedelta(days=i) for i in range(self.rows)]
-        
-        # Генерируем разные типы данных
-        data = {
-            'date': dates,
-            'category': np.random.choice(['A', 'B', 'C', 'D'], self.rows),
-            'value_int': np.random.randint(1, 1000, self.rows),
-            'value_float': np.random.uniform(0, 1000, self.rows),
-            'sales': np.random.exponential(100, self.rows),
-            'profit': np.random.normal(500, 200, self.rows),
-            'region': np.random.choice(['North', 'South', 'East', 'West'], self.rows),
-            'active': np.random.choice([True, False], self.rows),
-            'score': np.random.randint(1, 101, self.rows)
-        }
+    def read_csv(self):
+        """Читает CSV"""
+        if self.data_lib == 'pandas':
+            return self.from_arrow(self.read_csv_arrow())
+        return self.collect(pl.scan_csv(self.file_path))
         
+    def read_parquet(self):
+        """Читает Parquet"""
         if self.data_lib == 'pandas':
-            df = pd.DataFrame(data)
+            return self.from_arrow(self.read_parquet_arrow(self.file_path))
+        return self.collect(pl.scan_parquet(self.file_path))
+        
+    def read_excel(self):
+        """Читает Excel"""
+        # Excel разбирает calamine на Rust вместо openpyxl
+        if self.data_lib == 'pandas':
+            return pd.read_excel(self.file_path, engine='calamine')
+        return pl.read_excel(self.file_path, engine='calamine')
+        
+    def read_json(self):
+        """Читает JSON массив записей или NDJSON (запись на строку)"""
+        # JSON разбирает парсер polars на Rust, pandas получает Arrow буферы
+        if self.is_ndjson():
+            if self.data_lib == 'polars':
+                return self.collect(pl.scan_ndjson(self.file_path))
+            df = pl.read_ndjson(self.file_path)
         else:
-            df = pl.DataFrame(data)
-            
+            df = pl.read_json(self.file_path)
+        if self.data_lib == 'pandas':
+            return DataConverter.polars_to_pandas(df)
         return df
+        
+    def is_ndjson(self):
+        """Определяет NDJSON по первому значимому байту: массив начинается с '['"""
+        with open(self.file_path, 'rb') as f:
+            head = f.read(4096)
+        return not head.removeprefix(b'\xef\xbb\xbf').lstrip().startswith(b'[')
+        
+    def read_arrow_ipc(self):
+        """Читает файл Arrow IPC (Feather v2)"""
+        if self.data_lib == 'polars':
+            return self.collect(pl.scan_ipc(self.file_path))
+        return self.from_arrow(pa.ipc.open_file(pa.memory_map(self.file_path, 'rb')).read_all())
+        
+    def read_orc(self):
+        """Читает ORC"""
+        import pyarrow.orc as pa_orc  # модуль есть не во всех сборках pyarrow
+        return self.from_arrow(pa_orc.ORCFile(self.file_path).read())
+        
+    def read_unknown(self):
+        """Выбирает читатель по первым байтам файла, CSV - последний вариант"""
+        with open(self.file_path, 'rb') as f:
+            magic = f.read(8)
+        # Колоночные форматы читаются без разбора текста
+        if magic.startswith(b'PAR1'):
+            return self.read_parquet()
+        if magic.startswith(b'ARROW1'):
+            return self.read_arrow_ipc()
+        if magic.startswith(b'ORC'):
+            return self.read_orc()
+        return self.read_csv()
+        
+    # Чтение по расширению файла: один поиск в словаре вместо цепочки endswith
+    _READERS = {
+        '.csv': read_csv,
+        '.parquet': read_parquet,
+        '.xlsx': read_excel,
+        '.xls': read_excel,
+        '.json': read_json,
+        '.ndjson': read_json,
+        '.jsonl': read_json,
+        '.arrow': read_arrow_ipc,
+        '.feather': read_arrow_ipc,
+        '.orc': read_orc,
+    }
+    
+    def read_csv_arrow(self):
+        """Читает CSV потоковым парсером Arrow, сообщая прогресс по прочитанным байтам"""
+        read_options = pa_csv.ReadOptions(use_threads=True)
+        total = os.path.getsize(self.file_path) or 1
+        timer = QElapsedTimer()
+        timer.start()
+        batches = []
+        try:
+            with pa.input_stream(self.file_path) as source:
+                reader = pa_csv.open_csv(source, read_options=read_options)
+                for batch in reader:
+                    batches.append(batch)
+                    # Не чаще 20 раз в секунду, чтобы не переполнять очередь сигналов
+                    if timer.elapsed() >= 50:
+                        timer.restart()
+                        self.signals.progress_updated.emit(10 + int(85 * source.tell() / total))
+                return pa.Table.from_batches(batches, schema=reader.schema)
+        except pa.ArrowInvalid:
+            # Потоковый парсер выводит типы по первому блоку и падает, если дальше
+            # они меняются; read_csv расширяет типы по всему файлу
+            return pa_csv.read_csv(self.file_path, read_options=read_options)
+        
+    def read_parquet_arrow(self, path):
+        """Читает Parquet через отображение файла в память"""
+        # Страницы файла подгружает ОС по мере чтения колонок, без копии в куче
+        return pq.read_table(path, memory_map=True, use_threads=True)
+        
+    def from_arrow(self, table):
+        """Передает Arrow таблицу выбранной библиотеке"""
+        if self.data_lib == 'pandas':
+            # self_destruct освобождает буферы Arrow по мере конвертации
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        # polars использует буферы Arrow без копирования
+        return pl.from_arrow(table)
+        
+    def collect(self, lf):
+        """Выполняет ленивый запрос чтения потоковым движком"""
+        return lf.collect(engine='streaming')
+        
+    def load_test_data(self):
+        """Читает тестовые данные из кэша или генерирует и сохраняет их"""
+        path = os.path.join(
+            _TEST_DATA_CACHE_DIR,
+            f"testdata_v{_TEST_DATA_VERSION}_{self.rows}_{_TEST_DATA_SEED}.parquet"
+        )
+        if os.path.exists(path):
+            table = self.read_parquet_arrow(path)
+        else:
+            table = self.generate_random_table()
+            try:
+                os.makedirs(_TEST_DATA_CACHE_DIR, exist_ok=True)
+                self.prune_test_data_cache()
+                # Запись во временный файл: прерванная запись не оставит битый кэш
+                tmp_path = path + '.tmp'
+                pq.write_table(table, tmp_path, compression='zstd')
+                os.replace(tmp_path, path)
+            except OSError:
+                pass  # без кэша данные просто сгенерируются в следующий раз
+                
+        # Даты отсчитываются от текущего момента, поэтому в кэш не попадают
+        return self.from_arrow(table.add_column(0, 'date', pa.array(self.generate_dates())))
+        
+    def prune_test_data_cache(self):
+        """Удаляет устаревшие файлы кэша, чтобы каталог не рос без ограничений"""
+        prefix = f"testdata_v{_TEST_DATA_VERSION}_"
+        suffix = f"_{_TEST_DATA_SEED}.parquet"
+        current = []
+        for name in os.listdir(_TEST_DATA_CACHE_DIR):
+            if not name.startswith('testdata_'):
+                continue
+            path = os.path.join(_TEST_DATA_CACHE_DIR, name)
+            try:
+                if name.startswith(prefix) and name.endswith(suffix):
+                    current.append((os.path.getmtime(path), path))
+                else:
+                    # Другая версия формата, зерно или оставшийся .tmp
+                    os.remove(path)
+            except OSError:
+                pass
+                
+        # Место для нового файла освобождается за счет самых старых
+        current.sort(reverse=True)
+        for _, path in current[_TEST_DATA_CACHE_KEEP - 1:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+                
+    def generate_dates(self):
+        """Даты от текущего момента назад с шагом в сутки"""
+        # Генерируем даты одним проходом arange. Если сутки на строку выводят
+        # за _TEST_DATA_DATE_SPAN, шаг уменьшается, чтобы даты не ушли за 1677 год
+        now = np.datetime64(datetime.now(), 'us')
+        step = min(np.timedelta64(1, 'D'), _TEST_DATA_DATE_SPAN // max(self.rows, 1))
+        return np.arange(now, now - self.rows * step, -step)
+        
+    def generate_random_table(self):
+        """Генерирует случайные колонки тестовых данных в виде Arrow таблицы"""
+        data = {}
+        
+        # Генераторы NumPy отпускают GIL, поэтому колонки создаются параллельно.
+        # У каждой колонки свой поток случайных чисел от общего зерна - результат
+        # не зависит от порядка выполнения
+        seeds = np.random.SeedSequence(_TEST_DATA_SEED).spawn(len(_RANDOM_COLUMNS))
+        with ThreadPoolExecutor() as pool:
+            futures = [
+                (name, pool.submit(make, np.random.default_rng(seed), self.rows))
+                for (name, make), seed in zip(_RANDOM_COLUMNS, seeds)
+            ]
+            for name, future in futures:
+                data[name] = future.result()
+                
+        # Категории хранятся кодами: байт на строку вместо строки.
+        # Словарный массив Arrow становится pd.Categorical или pl.Categorical
+        data['category'] = pa.DictionaryArray.from_arrays(data['category'], pa.array(_CATEGORIES))
+        data['region'] = pa.DictionaryArray.from_arrays(data['region'], pa.array(_REGIONS))
+        
+        # Arrow таблица собирается из числовых массивов без копирования
+        return pa.table(data)
+
+
+def export_csv(table, file_path):
+    """Пишет Arrow таблицу в CSV пакетами строк"""
+    write_options = pa_csv.WriteOptions(include_header=True, batch_size=1 << 16)
+    # Буфер 1 МБ: пакеты уходят на диск крупными блоками, а не мелкими записями
+    with pa.output_stream(file_path, buffer_size=1 << 20) as sink:
+        pa_csv.write_csv(table, sink, write_options=write_options)
+
+
+def _batch_rows(batch):
+    """Переводит пакет Arrow в список строк-кортежей для записи в Excel"""
+    return list(zip(*(column.to_pylist() for column in batch.columns)))
 
 
-class ExportWorker(QThread):
-    """Поток для экспорта данных"""
+def export_excel(table, file_path):
+    """Пишет Arrow таблицу в Excel потоково, без копии данных в pandas"""
+    # write_only: строки сразу сериализуются и не хранятся в памяти
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(table.column_names)
+    
+    # Пакеты преобразуются и пишутся по очереди: в памяти только один пакет строк
+    for batch in table.to_batches(max_chunksize=50_000):
+        for row in _batch_rows(batch):
+            sheet.append(row)
+            
+    workbook.save(file_path)
+
+
+def export_json(table, file_path):
+    """Пишет Arrow таблицу в JSON массив записей"""
+    # polars читает Arrow буферы без копирования
+    pl.from_arrow(table).write_json(file_path)
+
+
+def export_parquet(table, file_path):
+    """Пишет Arrow таблицу в Parquet без промежуточных преобразований"""
+    pq.write_table(table, file_path)
+
+
+# Экспорт по формату: все форматы получают одну Arrow таблицу
+EXPORTERS = {
+    'csv': export_csv,
+    'excel': export_excel,
+    'json': export_json,
+    'parquet': export_parquet,
+}
+
+
+class ExportSignals(QObject):
+    """Сигналы задачи экспорта"""
     finished = pyqtSignal()
     error = pyqtSignal(str)
+
+
+class ExportWorker(QRunnable):
+    """Задача пула потоков для экспорта данных"""
     
     def __init__(self, data, data_lib, file_path, format_type):
         super().__init__()
+        self.signals = ExportSignals()
         self.data = data
         self.data_lib = data_lib
         self.file_path = file_path
@@ -108,27 +348,61 @@ class ExportWorker(QThread):
         
     def run(self):
         try:
-            if self.format_type == 'csv':
-                if self.data_lib == 'pandas':
-                    self.data.to_csv(self.file_path, index=False)
-                else:
-                    self.data.write_csv(self.file_path)
-                    
-            elif self.format_type == 'excel':
-                # Для Excel используем pandas
-                if self.data_lib == 'pandas':
-                    self.data.to_excel(self.file_path, index=False)
-                else:
-                    df_pd = self.data.to_pandas()
-                    df_pd.to_excel(self.file_path, index=False)
-                    
-            elif self.format_type == 'json':
-                if self.data_lib == 'pandas':
-                    self.data.to_json(self.file_path, orient='records', indent=2)
-                else:
-                    self.data.write_json(self.file_path)
-                    
-            self.finished.emit()
+            # Данные pandas и polars приводятся к одной Arrow таблице
+            table = DataConverter.to_arrow_table(self.data)
+            EXPORTERS[self.format_type](table, self.file_path)
+            self.signals.finished.emit()
             
         except Exception as e:
-            self.error.emit(f"Ошибка экспорта: {str(e)}")
\ No newline at end of file
+            self.signals.error.emit(f"Ошибка экспорта: {str(e)}")
+
+
+class ConversionSignals(QObject):
+    """Сигналы задачи конвертации (QRunnable не может их объявлять)"""
+    finished = pyqtSignal(object, str)  # (dataframe, data_lib)
+    error = pyqtSignal(str)
+
+
+class ConversionWorker(QRunnable):
+    """Задача пула потоков для конвертации между Pandas и Polars"""
+    
+    def __init__(self, data, target_lib):
+        super().__init__()
+        self.data = data
+        self.target_lib = target_lib
+        self.signals = ConversionSignals()
+        
+    def run(self):
+        try:
+            if self.target_lib == 'pandas':
+                df = DataConverter.polars_to_pandas(self.data)
+            else:  # polars
+                df = DataConverter.pandas_to_polars(self.data)
+                
+            self.signals.finished.emit(df, self.target_lib)
+            
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+class AnalysisSignals(QObject):
+    """Сигналы задачи анализа"""
+    finished = pyqtSignal(object, object)  # (ключ кэша, результат)
+    error = pyqtSignal(str)
+
+
+class AnalysisWorker(QRunnable):
+    """Задача пула потоков для анализа данных вне потока интерфейса"""
+    
+    def __init__(self, data, compute, key=None):
+        super().__init__()
+        self.data = data
+        self.compute = compute
+        self.key = key
+        self.signals = AnalysisSignals()
+        
+    def run(self):
+        try:
+            self.signals.finished.emit(self.key, self.compute(self.data))
+        except Exception as e:
+            self.signals.error.emit(str(e))